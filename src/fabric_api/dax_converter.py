@@ -718,6 +718,9 @@ def _cleanup_dax(expr: str) -> str:
 
 # ── Qlik format string → DAX format string ───────────────────────
 
+_TIME_MINUTE_RE = re.compile(r'(hh?):mm', re.IGNORECASE)
+
+
 def convert_qlik_format_to_dax(qlik_format: str) -> str:
     """Convert Qlik number/date format string to DAX format string."""
     if not qlik_format:
@@ -731,7 +734,7 @@ def convert_qlik_format_to_dax(qlik_format: str) -> str:
     dax_fmt = qlik_format
     # Qlik uses 'mm' for minutes, DAX uses 'nn'
     # But only when preceded by hh (to distinguish from MM month)
-    dax_fmt = re.sub(r'(hh?):mm', r'\1:nn', dax_fmt, flags=re.IGNORECASE)
+    dax_fmt = _TIME_MINUTE_RE.sub(r'\1:nn', dax_fmt)
 
     return dax_fmt
 
@@ -37,6 +37,7 @@ Structure PBI Project 4.0
 import json
 import logging
 import re
+import sys
 import uuid
 import hashlib
 from pathlib import Path
@@ -55,6 +56,18 @@ _SCHEMA_PAGES = "https://developer.microsoft.com/json-schemas/fabric/item/report
 _SCHEMA_PAGE = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/page/2.0.0/schema.json"
 _SCHEMA_VISUAL = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.5.0/schema.json"
 
+# ── Pre-rendered column property lines ────────────────────────────
+# dataType / summarizeBy take values from a small closed set; sharing one
+# interned string per line avoids rebuilding it for every column.
+_DATA_TYPE_LINES = {
+    t: sys.intern(f"\t\tdataType: {t}")
+    for t in ("string", "int64", "double", "decimal", "dateTime", "boolean", "binary")
+}
+_SUMMARIZE_BY_LINES = {
+    s: sys.intern(f"\t\tsummarizeBy: {s}")
+    for s in ("none", "sum", "count", "min", "max", "average", "distinctCount")
+}
+
 
 def _new_guid() -> str:
     """Generate a new GUID string."""
@@ -977,12 +990,12 @@ class TMDLGenerator:
             else:
                 lines.append(f"\tcolumn {_quote_tmdl(col_name)}")
 
-            lines.append(f"\t\tdataType: {data_type}")
+            lines.append(_DATA_TYPE_LINES.get(data_type) or f"\t\tdataType: {data_type}")
             fmt_str = col.get("formatString", "")
             if fmt_str:
                 lines.append(f"\t\tformatString: {fmt_str}")
             lines.append(f"\t\tlineageTag: {col_tag}")
-            lines.append(f"\t\tsummarizeBy: {summarize}")
+            lines.append(_SUMMARIZE_BY_LINES.get(summarize) or f"\t\tsummarizeBy: {summarize}")
 
             # Display folder
             display_folder = col.get("displayFolder", "")
@@ -0,0 +1,265 @@
+"""
+Tests unitaires des convertisseurs de tools/ (migration, analyse)
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from migrate_advanced_aggregations import AdvancedAggregationConverter
+
+
+def _load_analysis_module(name):
+    """Charge un script de tools/analysis (dossier hors sys.path)"""
+    module_path = Path(__file__).resolve().parent.parent / "tools" / "analysis" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def pq():
+    return _load_analysis_module("generate_pq_from_sources")
+
+
+class TestAggrInnerAggregation:
+    """Argument de l'agrégation interne d'Aggr() : parenthèses imbriquées conservées"""
+
+    @pytest.fixture
+    def converter(self):
+        return AdvancedAggregationConverter()
+
+    def test_simple_sum(self, converter):
+        result = converter.convert_aggr_function("Aggr(Sum(Sales), Customer)")
+        assert result["dax"] == "SUMX(VALUES(Customer), [Sales])"
+        assert result["confidence"] == 85
+
+    def test_sum_nested_function(self, converter):
+        result = converter.convert_aggr_function("Aggr(Sum(Round(Sales)), Customer)")
+        assert result["dax"] == "SUMX(VALUES(Customer), [Round(Sales)])"
+
+    def test_avg_nested_parentheses(self, converter):
+        result = converter.convert_aggr_function("Aggr(Avg(Price*(1-Discount)), Product)")
+        assert result["dax"] == "AVERAGEX(VALUES(Product), [Price*(1-Discount)])"
+        assert result["confidence"] == 85
+
+
+class TestPowerQueryMString:
+    """Littéraux texte M des chemins sources : guillemets doublés, « #( » échappé"""
+
+    def test_plain_value_unchanged(self, pq):
+        assert pq._m_string(r"C:\Data\sales.csv") == r"C:\Data\sales.csv"
+
+    def test_double_quote_doubled(self, pq):
+        assert pq._m_string('a"b"c') == 'a""b""c'
+
+    def test_escape_sequence_opener(self, pq):
+        assert pq._m_string("a#(lf)b") == "a#(#)(lf)b"
+
+    def test_quote_and_escape_opener(self, pq):
+        assert pq._m_string('x#("y")') == 'x#(#)(""y"")'
+
+    def test_csv_script_uses_escaped_path(self, pq):
+        script = pq.generate_csv_pq(Path('/data/q"1#(tab).csv'))
+        assert 'File.Contents("/data/q""1#(#)(tab).csv")' in script
+
+
+class TestPowerQuerySourceOrder:
+    """Sources énumérées dans un ordre stable : .xlsx, .xls puis .csv, triés par nom"""
+
+    def test_sorted_and_grouped(self, pq, tmp_path, capsys):
+        source = tmp_path / "src"
+        source.mkdir()
+        for name in ["b.csv", "z.xls", "c.XLSX", "a.xlsx", "A.CSV", "notes.txt"]:
+            (source / name).write_text("")
+        pq.generate_all_pq_scripts(str(source), str(tmp_path / "out"))
+        listed = [line.split()[1] for line in capsys.readouterr().out.splitlines()
+                  if line.startswith("✅ ") and "→" in line]
+        assert listed == ["a.xlsx", "c.XLSX", "z.xls", "A.CSV", "b.csv"]
+
+
+# Document app.json minimal : master items, feuilles avec actions, bookmarks
+_APP_JSON = {
+    "qSheetList": [
+        {
+            "qInfo": {"qId": "s1"},
+            "qMetaDef": {"title": "Ventes"},
+            "qSheetDef": {"qMetaDef": {"actions": [
+                {"id": "a1", "label": "Détail", "type": "navigation",
+                 "navigation": {"targetSheetId": "s2"}},
+                {"id": "a2", "label": "Site", "type": "navigation",
+                 "navigation": {"targetUri": "https://example.com/a?b=1"}},
+            ]}},
+        },
+        {"qInfo": {"qId": "s2"}, "qMetaDef": {"title": "Détail"}},
+    ],
+    "properties": {
+        "qDimensionList": [
+            {"qInfo": {"qId": "d1"}, "qMetaDef": {"title": "Année", "description": "é\"x"},
+             "qDim": {"qFieldDefs": ["Year", "Month"], "qGrouping": "H"}},
+        ],
+        "qMeasureList": [
+            {"qInfo": {"qId": "m1"}, "qMetaDef": {"title": "CA"},
+             "qMeasure": {"qDef": "Sum({<Year={2024}>} Sales)", "qNumFormat": {"qFmt": "#,##0.5"}}},
+        ],
+        "qBookmarkList": [
+            {"qInfo": {"qId": "b1"}, "qMetaDef": {"title": "Signet / 1"},
+             "qBookmark": {"qStateData": [{"qFieldItems": [{"qDef": {"qName": "Year"}}]}]}},
+        ],
+    },
+}
+
+
+@pytest.fixture
+def qvf_file(tmp_path):
+    import json
+    import zipfile
+    path = tmp_path / "app.qvf"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as qvf:
+        qvf.writestr("app.json", json.dumps(_APP_JSON, ensure_ascii=False))
+    return path
+
+
+def _without_fast_json(monkeypatch, *modules):
+    """Force le repli sur le module json standard (orjson/ijson/ujson absents)"""
+    import _common
+    for module in (_common,) + modules:
+        for name in ("orjson", "ijson", "ujson"):
+            if hasattr(module, name):
+                monkeypatch.setattr(module, name, None)
+
+
+class TestFastJsonFallback:
+    """Chemins rapides optionnels (extra « fast ») et repli json : mêmes résultats"""
+
+    def test_write_json_bytes(self, tmp_path, monkeypatch):
+        import _common
+        data = {"é": [1, 2.5, None], "b": {"c": "x/y"}}
+        fast = tmp_path / "fast.json"
+        _common.write_json(fast, data)
+        _without_fast_json(monkeypatch)
+        fallback = tmp_path / "fallback.json"
+        _common.write_json(fallback, data)
+        assert fast.read_bytes() == fallback.read_bytes()
+
+    def test_navigation_extraction(self, qvf_file, monkeypatch):
+        import migrate_navigation
+        fast = migrate_navigation.extract_sheet_actions_from_qvf(str(qvf_file))
+        _without_fast_json(monkeypatch, migrate_navigation)
+        fallback = migrate_navigation.extract_sheet_actions_from_qvf(str(qvf_file))
+        assert fast == fallback
+        assert fast["metadata"]["total_actions"] == 2
+
+    def test_master_items_extraction(self, qvf_file, tmp_path, monkeypatch):
+        import migrate_master_items
+        fast = migrate_master_items.MasterItemsMigrator(output_dir=tmp_path / "fast")
+        fast.extract_master_items(qvf_file)
+        _without_fast_json(monkeypatch, migrate_master_items)
+        fallback = migrate_master_items.MasterItemsMigrator(output_dir=tmp_path / "fallback")
+        fallback.extract_master_items(qvf_file)
+        assert (fast.dimensions, fast.measures) == (fallback.dimensions, fallback.measures)
+        assert len(fast.dimensions) == len(fast.measures) == 1
+
+    def test_bookmarks_json(self, qvf_file, tmp_path, monkeypatch):
+        import migrate_bookmarks
+
+        def write(name):
+            migrator = migrate_bookmarks.BookmarkMigrator(output_dir=tmp_path / name)
+            try:
+                assert migrator.write_bookmarks_json(qvf_file, tmp_path / f"{name}.json") == 1
+            finally:
+                migrator.close()
+            return (tmp_path / f"{name}.json").read_bytes()
+
+        fast = write("fast")
+        # Sans orjson : ujson s'il est installé
+        monkeypatch.setattr(migrate_bookmarks, "orjson", None)
+        assert write("ujson") == fast
+        _without_fast_json(monkeypatch, migrate_bookmarks)
+        assert write("fallback") == fast
+
+
+class TestNavigationReadErrors:
+    """Lecture d'app.json en échec : code 1 et aucun fichier de sortie"""
+
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_truncated_app_json(self, tmp_path, monkeypatch, fast):
+        import json
+        import zipfile
+        import migrate_navigation
+        if not fast:
+            _without_fast_json(monkeypatch, migrate_navigation)
+        qvf_path = tmp_path / "truncated.qvf"
+        document = json.dumps(_APP_JSON)
+        with zipfile.ZipFile(qvf_path, "w") as qvf:
+            qvf.writestr("app.json", document[:document.index('"qInfo": {"qId": "s2"}')])
+        output_dir = tmp_path / "out"
+        assert migrate_navigation.run(str(qvf_path), str(output_dir)) == 1
+        assert not any(output_dir.iterdir())
+
+
+class TestJsonArrayWriters:
+    """Tableaux JSON écrits élément par élément : même mise en forme que json.dumps(indent=2)"""
+
+    ITEMS = [{"a": 1, "b": [1, 2]}, {"c": "é"}]
+
+    def _write(self, items, depth):
+        from _common import json_array_end, json_array_item
+        return "".join(json_array_item(item, i == 0, depth) for i, item in enumerate(items)) \
+            + json_array_end(len(items), depth)
+
+    @pytest.mark.parametrize("items", [ITEMS, []])
+    def test_top_level_array(self, items):
+        import json
+        assert self._write(items, 0) == json.dumps(items, indent=2, ensure_ascii=False)
+
+    @pytest.mark.parametrize("items", [ITEMS, []])
+    def test_array_in_root_object(self, items):
+        import json
+        text = '{\n  "items": ' + self._write(items, 1) + "\n}"
+        assert text == json.dumps({"items": items}, indent=2, ensure_ascii=False)
+
+
+class TestBookmarksNullSections:
+    """Sections null dans app.json (properties, qMetaDef, qBookmark) : valeurs par défaut"""
+
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_null_properties(self, tmp_path, monkeypatch, fast):
+        import json
+        import zipfile
+        import migrate_bookmarks
+        if not fast:
+            _without_fast_json(monkeypatch, migrate_bookmarks)
+        qvf_path = tmp_path / "null.qvf"
+        with zipfile.ZipFile(qvf_path, "w") as qvf:
+            qvf.writestr("app.json", json.dumps({"properties": None}))
+        migrator = migrate_bookmarks.BookmarkMigrator(output_dir=tmp_path / "out")
+        try:
+            assert migrator.write_bookmarks_json(qvf_path, tmp_path / "bookmarks.json") == 0
+        finally:
+            migrator.close()
+
+    def test_null_meta_and_state(self):
+        from migrate_bookmarks import BookmarkMigrator
+        [bookmark] = BookmarkMigrator._to_bookmarks(iter([{"qId": "b", "qMetaDef": None, "qBookmark": None}]))
+        assert (bookmark.name, bookmark.description, bookmark.selections) == ("Untitled", "", ())
+
+
+class TestCallCaptured:
+    """Sortie console d'un worker (print et logging) renvoyée au parent, dans l'ordre"""
+
+    def test_print_and_logging_interleaved(self):
+        import logging
+        from _common import call_captured
+
+        def work(value):
+            print("début")
+            logging.getLogger("migrate_test").info("valeur %d", value)
+            print("fin")
+            return value * 2
+
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        assert call_captured(work, 21) == (42, "début\nvaleur 21\nfin\n")
+        assert (root.handlers, root.level) == (handlers, level)
@@ -12,6 +12,7 @@ Covers:
  - Deployment: sensitivity labels, refresh schedule, incremental refresh, pipeline
  - Multi-page reports with bookmarks
 """
+import copy
 import json
 import tempfile
 from pathlib import Path
@@ -36,6 +37,18 @@ from fabric_api.visual_generator import (
     generate_visual_containers,
 )
 
+# Minimal semantic model shared by the TMDL tests; deep-copy before mutating.
+_BASE_MODEL = {
+    "compatibilityLevel": 1600,
+    "model": {
+        "culture": "en-US",
+        "defaultPowerBIDataSourceVersion": "powerBI_V3",
+        "tables": [],
+        "relationships": [],
+        "annotations": [],
+    },
+}
+
 
 # ==================================================================
 # DAX Converter — Variable Expansion
@@ -213,26 +226,18 @@ class TestTMDLEnhancements:
         gen = TMDLGenerator()
         with tempfile.TemporaryDirectory() as tmp:
             out = Path(tmp) / "proj"
-            model = {
-                "compatibilityLevel": 1600,
-                "model": {
-                    "culture": "en-US",
-                    "defaultPowerBIDataSourceVersion": "powerBI_V3",
-                    "tables": [{
-                        "name": "Sales",
-                        "columns": [
-                            {"name": "Amount", "dataType": "double",
-                             "sourceColumn": "Amount", "displayFolder": "Financials"},
-                        ],
-                        "measures": [
-                            {"name": "Total Sales", "expression": "SUM([Amount])",
-                             "displayFolder": "KPIs"},
-                        ],
-                    }],
-                    "relationships": [],
-                    "annotations": [],
-                },
-            }
+            model = copy.deepcopy(_BASE_MODEL)
+            model["model"]["tables"] = [{
+                "name": "Sales",
+                "columns": [
+                    {"name": "Amount", "dataType": "double",
+                     "sourceColumn": "Amount", "displayFolder": "Financials"},
+                ],
+                "measures": [
+                    {"name": "Total Sales", "expression": "SUM([Amount])",
+                     "displayFolder": "KPIs"},
+                ],
+            }]
             gen.create_pbi_project(out, "TestFolders", bim_model=model)
             tmdl = (out / "TestFolders.SemanticModel" / "definition" / "tables" / "Sales.tmdl").read_text("utf-8")
             assert "displayFolder: Financials" in tmdl
@@ -242,27 +247,19 @@ class TestTMDLEnhancements:
         gen = TMDLGenerator()
         with tempfile.TemporaryDirectory() as tmp:
             out = Path(tmp) / "proj"
-            model = {
-                "compatibilityLevel": 1600,
-                "model": {
-                    "culture": "en-US",
-                    "defaultPowerBIDataSourceVersion": "powerBI_V3",
-                    "tables": [{
-                        "name": "T1",
-                        "description": "Main sales table",
-                        "columns": [
-                            {"name": "C1", "dataType": "string", "sourceColumn": "C1",
-                             "description": "Customer identifier"},
-                        ],
-                        "measures": [
-                            {"name": "M1", "expression": "COUNT([C1])",
-                             "description": "Count of customers"},
-                        ],
-                    }],
-                    "relationships": [],
-                    "annotations": [],
-                },
-            }
+            model = copy.deepcopy(_BASE_MODEL)
+            model["model"]["tables"] = [{
+                "name": "T1",
+                "description": "Main sales table",
+                "columns": [
+                    {"name": "C1", "dataType": "string", "sourceColumn": "C1",
+                     "description": "Customer identifier"},
+                ],
+                "measures": [
+                    {"name": "M1", "expression": "COUNT([C1])",
+                     "description": "Count of customers"},
+                ],
+            }]
             gen.create_pbi_project(out, "TestDesc", bim_model=model)
             tmdl = (out / "TestDesc.SemanticModel" / "definition" / "tables" / "T1.tmdl").read_text("utf-8")
             assert "description: Main sales table" in tmdl
@@ -273,26 +270,18 @@ class TestTMDLEnhancements:
         gen = TMDLGenerator()
         with tempfile.TemporaryDirectory() as tmp:
             out = Path(tmp) / "proj"
-            model = {
-                "compatibilityLevel": 1600,
-                "model": {
-                    "culture": "en-US",
-                    "defaultPowerBIDataSourceVersion": "powerBI_V3",
-                    "tables": [{
-                        "name": "TimeCalc",
-                        "columns": [{"name": "Name", "dataType": "string", "sourceColumn": "Name"}],
-                        "calculationGroups": [{
-                            "name": "TimePeriod",
-                            "calculationItems": [
-                                {"name": "YTD", "expression": "CALCULATE(SELECTEDMEASURE(), DATESYTD('Calendar'[Date]))"},
-                                {"name": "MTD", "expression": "CALCULATE(SELECTEDMEASURE(), DATESMTD('Calendar'[Date]))"},
-                            ],
-                        }],
-                    }],
-                    "relationships": [],
-                    "annotations": [],
-                },
-            }
+            model = copy.deepcopy(_BASE_MODEL)
+            model["model"]["tables"] = [{
+                "name": "TimeCalc",
+                "columns": [{"name": "Name", "dataType": "string", "sourceColumn": "Name"}],
+                "calculationGroups": [{
+                    "name": "TimePeriod",
+                    "calculationItems": [
+                        {"name": "YTD", "expression": "CALCULATE(SELECTEDMEASURE(), DATESYTD('Calendar'[Date]))"},
+                        {"name": "MTD", "expression": "CALCULATE(SELECTEDMEASURE(), DATESMTD('Calendar'[Date]))"},
+                    ],
+                }],
+            }]
             gen.create_pbi_project(out, "TestCalcGroup", bim_model=model)
             tmdl = (out / "TestCalcGroup.SemanticModel" / "definition" / "tables" / "TimeCalc.tmdl").read_text("utf-8")
             assert "calculationGroup" in tmdl
@@ -303,19 +292,11 @@ class TestTMDLEnhancements:
         gen = TMDLGenerator()
         with tempfile.TemporaryDirectory() as tmp:
             out = Path(tmp) / "proj"
-            model = {
-                "compatibilityLevel": 1600,
-                "model": {
-                    "culture": "en-US",
-                    "defaultPowerBIDataSourceVersion": "powerBI_V3",
-                    "tables": [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}],
-                    "relationships": [],
-                    "annotations": [],
-                    "perspectives": [
-                        {"name": "SalesView", "tables": ["T1"]},
-                    ],
-                },
-            }
+            model = copy.deepcopy(_BASE_MODEL)
+            model["model"]["tables"] = [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}]
+            model["model"]["perspectives"] = [
+                {"name": "SalesView", "tables": ["T1"]},
+            ]
             gen.create_pbi_project(out, "TestPersp", bim_model=model)
             persp_file = out / "TestPersp.SemanticModel" / "definition" / "perspectives.tmdl"
             assert persp_file.exists()
@@ -326,21 +307,13 @@ class TestTMDLEnhancements:
         gen = TMDLGenerator()
         with tempfile.TemporaryDirectory() as tmp:
             out = Path(tmp) / "proj"
-            model = {
-                "compatibilityLevel": 1600,
-                "model": {
-                    "culture": "en-US",
-                    "defaultPowerBIDataSourceVersion": "powerBI_V3",
-                    "tables": [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}],
-                    "relationships": [],
-                    "annotations": [],
-                    "cultures": [
-                        {"name": "fr-FR", "translations": [
-                            {"name": "T1", "translatedCaption": "Tableau1"},
-                        ]},
-                    ],
-                },
-            }
+            model = copy.deepcopy(_BASE_MODEL)
+            model["model"]["tables"] = [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}]
+            model["model"]["cultures"] = [
+                {"name": "fr-FR", "translations": [
+                    {"name": "T1", "translatedCaption": "Tableau1"},
+                ]},
+            ]
             gen.create_pbi_project(out, "TestCulture", bim_model=model)
             culture_file = out / "TestCulture.SemanticModel" / "definition" / "cultures" / "fr-FR.tmdl"
             assert culture_file.exists()
@@ -354,16 +327,8 @@ class TestMultiPageReports:
         gen = TMDLGenerator()
         with tempfile.TemporaryDirectory() as tmp:
             out = Path(tmp) / "proj"
-            model = {
-                "compatibilityLevel": 1600,
-                "model": {
-                    "culture": "en-US",
-                    "defaultPowerBIDataSourceVersion": "powerBI_V3",
-                    "tables": [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}],
-                    "relationships": [],
-                    "annotations": [],
-                },
-            }
+            model = copy.deepcopy(_BASE_MODEL)
+            model["model"]["tables"] = [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}]
             sheets = [
                 {"id": "s1", "title": "Overview"},
                 {"id": "s2", "title": "Details"},
@@ -378,16 +343,8 @@ class TestMultiPageReports:
         gen = TMDLGenerator()
         with tempfile.TemporaryDirectory() as tmp:
             out = Path(tmp) / "proj"
-            model = {
-                "compatibilityLevel": 1600,
-                "model": {
-                    "culture": "en-US",
-                    "defaultPowerBIDataSourceVersion": "powerBI_V3",
-                    "tables": [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}],
-                    "relationships": [],
-                    "annotations": [],
-                },
-            }
+            model = copy.deepcopy(_BASE_MODEL)
+            model["model"]["tables"] = [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}]
             bookmarks = [
                 {"name": "Sales View", "selections": []},
                 {"name": "Cost View", "selections": []},
@@ -487,16 +444,8 @@ class TestThemeGeneration:
         gen = TMDLGenerator()
         with tempfile.TemporaryDirectory() as tmp:
             out = Path(tmp) / "proj"
-            model = {
-                "compatibilityLevel": 1600,
-                "model": {
-                    "culture": "en-US",
-                    "defaultPowerBIDataSourceVersion": "powerBI_V3",
-                    "tables": [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}],
-                    "relationships": [],
-                    "annotations": [],
-                },
-            }
+            model = copy.deepcopy(_BASE_MODEL)
+            model["model"]["tables"] = [{"name": "T1", "columns": [{"name": "C1", "dataType": "string", "sourceColumn": "C1"}]}]
             gen.create_pbi_project(out, "TestTheme", bim_model=model,
                                    theme={"name": "MyQlikTheme", "colors": ["#AAA", "#BBB"]})
             theme_dir = out / "TestTheme.Report" / "definition" / "StaticResources" / "SharedResources" / "BaseThemes"
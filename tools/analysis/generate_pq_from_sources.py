@@ -2,30 +2,53 @@
 Générateur de scripts Power Query M depuis fichiers sources
 Crée automatiquement les scripts .pq pour Excel et CSV
 """
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 import re
 
+_EXCEL_EXTS = ('.xlsx', '.xls')
+
+_NONWORD_RE = re.compile(r'[^\w]+')
+_MULTI_UNDERSCORE_RE = re.compile(r'_+')
+# Table ASCII : tout caractère hors [A-Za-z0-9_] devient '_'
+_SANITIZE_TABLE = {
+    c: ord('_') for c in range(128)
+    if not (chr(c).isalnum() or chr(c) == '_')
+}
+
+def _m_string(value: str) -> str:
+    """Échappe une valeur pour un littéral texte Power Query M ("" pour ", #(#)( pour #()"""
+    # M n'a pas d'échappement par antislash : les guillemets se doublent et
+    # « #( », qui ouvre une séquence d'échappement M, s'écrit #(#)(
+    return value.replace('#(', '#(#)(').replace('"', '""')
+
 def sanitize_name(name: str) -> str:
     """Nettoie un nom de fichier pour créer un nom de table valide"""
     # Supprimer l'extension
     name = Path(name).stem
     # Remplacer espaces et caractères spéciaux par underscore
-    name = re.sub(r'[^\w]+', '_', name)
-    # Supprimer underscores multiples
-    name = re.sub(r'_+', '_', name)
+    if name.isascii():
+        name = name.translate(_SANITIZE_TABLE)
+        # Supprimer underscores multiples
+        while '__' in name:
+            name = name.replace('__', '_')
+    else:
+        name = _NONWORD_RE.sub('_', name)
+        name = _MULTI_UNDERSCORE_RE.sub('_', name)
     # Supprimer underscores début/fin
     name = name.strip('_')
     return name
 
 def generate_excel_pq(file_path: Path, sheet_name: str = None) -> str:
     """Génère un script Power Query M pour un fichier Excel"""
-    table_name = sanitize_name(file_path.name)
-    file_path_str = str(file_path).replace('\\', '\\\\')
+    file_path_str = _m_string(str(file_path))
     
     # Si pas de nom de feuille spécifié, utiliser le nom de fichier
     if not sheet_name:
-        sheet_name = table_name
+        sheet_name = sanitize_name(file_path.name)
     
     script = f'''let
     // Source: {file_path.name}
@@ -59,8 +82,7 @@ in
 
 def generate_csv_pq(file_path: Path, delimiter: str = ",", encoding: int = 65001) -> str:
     """Génère un script Power Query M pour un fichier CSV"""
-    table_name = sanitize_name(file_path.name)
-    file_path_str = str(file_path).replace('\\', '\\\\')
+    file_path_str = _m_string(str(file_path))
     
     script = f'''let
     // Source: {file_path.name}
@@ -92,6 +114,11 @@ in
 '''
     return script
 
+def _write_pq(task) -> None:
+    """Écrit un script .pq ; task = (chemin de sortie, contenu)"""
+    output_file, script = task
+    output_file.write_text(script, encoding='utf-8')
+
 def generate_all_pq_scripts(source_folder: str, output_folder: str = None):
     """Génère tous les scripts Power Query pour les fichiers d'un dossier"""
     source_path = Path(source_folder)
@@ -114,78 +141,98 @@ def generate_all_pq_scripts(source_folder: str, output_folder: str = None):
     print(f"📁 Source: {source_path}")
     print(f"📂 Sortie: {output_path}\n")
     
-    generated_count = 0
-    
-    # Traiter fichiers Excel
-    excel_files = list(source_path.glob("*.xlsx")) + list(source_path.glob("*.xls"))
+    # Classer les fichiers sources en un seul parcours du dossier
+    # (extensions sans distinction de casse ; ordre trié par nom, .xlsx avant .xls)
+    excel_files = []
+    csv_files = []
+    with os.scandir(source_path) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if not entry.is_file():
+                continue
+            name = entry.name.lower()
+            if name.endswith(_EXCEL_EXTS):
+                excel_files.append(Path(entry.path))
+            elif name.endswith('.csv'):
+                csv_files.append(Path(entry.path))
+    excel_files.sort(key=lambda path: not path.name.lower().endswith('.xlsx'))
+    
+    # Générer les scripts (fichiers Excel puis CSV)
+    tasks = []
     for excel_file in excel_files:
         table_name = sanitize_name(excel_file.name)
         output_file = output_path / f"{table_name}.pq"
-        
-        # Générer script
-        script = generate_excel_pq(excel_file, sheet_name=table_name)
-        
-        # Sauvegarder
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(script)
-        
-        print(f"✅ {excel_file.name:40} → {output_file.name}")
-        generated_count += 1
-    
-    # Traiter fichiers CSV
-    csv_files = list(source_path.glob("*.csv"))
+        tasks.append((excel_file, output_file, generate_excel_pq(excel_file, sheet_name=table_name)))
+    
     for csv_file in csv_files:
         table_name = sanitize_name(csv_file.name)
         output_file = output_path / f"{table_name}.pq"
-        
-        # Générer script
-        script = generate_csv_pq(csv_file)
-        
-        # Sauvegarder
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(script)
-        
-        print(f"✅ {csv_file.name:40} → {output_file.name}")
-        generated_count += 1
-    
-    print(f"\n{'='*70}")
-    print(f"✅ {generated_count} script(s) Power Query généré(s)")
-    print(f"{'='*70}\n")
+        tasks.append((csv_file, output_file, generate_csv_pq(csv_file)))
+    
+    # Sauvegarder en parallèle (le dernier script gagne si deux sources
+    # produisent le même nom de table, comme en traitement séquentiel)
+    outputs = {output_file: script for _, output_file, script in tasks}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_write_pq, outputs.items()))
+    
+    log_lines = [
+        f"✅ {source_file.name:40} → {output_file.name}"
+        for source_file, output_file, _ in tasks
+    ]
+    generated_count = len(tasks)
+    
+    log_lines += [
+        f"\n{'='*70}",
+        f"✅ {generated_count} script(s) Power Query généré(s)",
+        f"{'='*70}\n",
+    ]
     
     # Instructions
     if generated_count > 0:
-        print("📋 PROCHAINES ÉTAPES:\n")
-        print("1. Ouvrir Power BI Desktop")
-        print("2. Obtenir des données → Requête vide")
-        print("3. Éditeur avancé → Copier le contenu d'un fichier .pq")
-        print("4. OK → Renommer la requête")
-        print("5. Répéter pour chaque fichier .pq")
-        print("6. Fermer et appliquer\n")
-        print("💡 Astuce: Créer une fonction Power Query pour automatiser !\n")
-        
-        # Créer un fichier récapitulatif
-        summary_file = output_path / "README.txt"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write("SCRIPTS POWER QUERY GÉNÉRÉS\n")
-            f.write("=" * 70 + "\n\n")
-            f.write(f"Dossier source: {source_path}\n")
-            f.write(f"Date génération: {Path(__file__).stat().st_mtime}\n\n")
-            f.write("FICHIERS GÉNÉRÉS:\n\n")
-            
-            for pq_file in sorted(output_path.glob("*.pq")):
-                f.write(f"  - {pq_file.name}\n")
-            
-            f.write("\n" + "=" * 70 + "\n")
-            f.write("UTILISATION:\n\n")
-            f.write("1. Ouvrir Power BI Desktop\n")
-            f.write("2. Obtenir des données → Requête vide\n")
-            f.write("3. Éditeur avancé → Copier contenu .pq\n")
-            f.write("4. Répéter pour chaque fichier\n")
-            f.write("5. Créer relations dans Vue Modèle\n\n")
-        
-        print(f"📄 Récapitulatif créé: {summary_file}\n")
-    else:
+        log_lines += [
+            "📋 PROCHAINES ÉTAPES:\n",
+            "1. Ouvrir Power BI Desktop",
+            "2. Obtenir des données → Requête vide",
+            "3. Éditeur avancé → Copier le contenu d'un fichier .pq",
+            "4. OK → Renommer la requête",
+            "5. Répéter pour chaque fichier .pq",
+            "6. Fermer et appliquer\n",
+            "💡 Astuce: Créer une fonction Power Query pour automatiser !\n",
+        ]
+    sys.stdout.write("\n".join(log_lines) + "\n")
+    
+    if generated_count == 0:
         print("⚠️ Aucun fichier Excel ou CSV trouvé dans le dossier source\n")
+        return
+    
+    # Créer un fichier récapitulatif
+    summary_file = output_path / "README.txt"
+    lines = [
+        "SCRIPTS POWER QUERY GÉNÉRÉS",
+        "=" * 70,
+        "",
+        f"Dossier source: {source_path}",
+        f"Date génération: {datetime.now().isoformat(sep=' ', timespec='seconds')}",
+        "",
+        "FICHIERS GÉNÉRÉS:",
+        "",
+    ]
+    lines.extend(f"  - {pq_file.name}" for pq_file in sorted(output_path.glob("*.pq")))
+    lines += [
+        "",
+        "=" * 70,
+        "UTILISATION:",
+        "",
+        "1. Ouvrir Power BI Desktop",
+        "2. Obtenir des données → Requête vide",
+        "3. Éditeur avancé → Copier contenu .pq",
+        "4. Répéter pour chaque fichier",
+        "5. Créer relations dans Vue Modèle",
+        "",
+        "",
+    ]
+    summary_file.write_text("\n".join(lines), encoding='utf-8')
+    
+    print(f"📄 Récapitulatif créé: {summary_file}\n")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Utilitaires communs aux migrateurs : sortie console, répertoire de sortie,
+lecture et mise en forme JSON, guides Markdown, configuration JSON, fichiers
+réécrits seulement s'ils changent.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+from logging.handlers import MemoryHandler
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Tuple, Union
+
+try:
+    import orjson  # Sérialiseur JSON natif (optionnel)
+except ImportError:
+    orjson = None
+
+# Nombre d'enregistrements de log gardés en mémoire avant écriture sur stdout
+_LOG_CAPACITY = 1024
+
+# Dictionnaire vide partagé (lecture seule) pour les sous-objets absents
+EMPTY = MappingProxyType({})
+
+
+def setup_console_logging() -> None:
+    """Sortie console des migrateurs : messages bruts sur stdout, tamponnés
+    et vidés en fin d'exécution (ou dès une erreur)"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[
+        MemoryHandler(_LOG_CAPACITY, flushLevel=logging.ERROR, target=logging.StreamHandler(sys.stdout))
+    ])
+
+
+def call_captured(func: Callable[..., Any], *args) -> Tuple[Any, str]:
+    """Appelle func(*args) dans un processus worker et renvoie (résultat, sortie console).
+
+    print() et logging sont capturés dans le même tampon, dans l'ordre
+    d'émission, pour être réaffichés par le parent dans l'ordre des fichiers.
+    Les handlers hérités du parent sont écartés pendant l'appel : un
+    MemoryHandler copié au fork pourrait réémettre des enregistrements déjà
+    tamponnés.
+    """
+    output = io.StringIO()
+    handler = logging.StreamHandler(output)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    root.handlers = [handler]
+    root.setLevel(logging.INFO)
+    try:
+        with contextlib.redirect_stdout(output):
+            result = func(*args)
+    finally:
+        root.handlers = handlers
+        root.setLevel(level)
+    return result, output.getvalue()
+
+
+def ensure_output_dir(path: Union[str, Path]) -> Path:
+    """Crée le répertoire de sortie (et ses parents) s'il n'existe pas"""
+    output_dir = Path(path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
+def loads(data: bytes):
+    """Désérialise un document JSON (UTF-8) ; orjson accepte directement les octets"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def intern_str(value):
+    """Interne une valeur si c'est une chaîne (valeurs répétées d'un objet à l'autre)"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def dumps_indented(obj) -> str:
+    """Sérialise en JSON indenté (2 espaces), sans échappement ASCII"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def json_array_item(item: Dict, first: bool, depth: int = 1) -> str:
+    """Élément de tableau JSON mis en forme comme json.dump(indent=2), le tableau
+    étant au niveau `depth` (0 : document, 1 : valeur d'une clé de l'objet racine)"""
+    indent = '\n' + '  ' * (depth + 1)
+    return ('[' if first else ',') + indent + dumps_indented(item).replace('\n', indent)
+
+
+def json_array_end(count: int, depth: int = 1) -> str:
+    """Fermeture d'un tableau JSON de `count` éléments écrits par json_array_item"""
+    return '\n' + '  ' * depth + ']' if count else '[]'
+
+
+def _write_raw(path: Path, data: bytes) -> None:
+    """Écrit data directement sur le descripteur, sans couche d'E/S Python"""
+    fd = os.open(os.fspath(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def write_if_changed(path: Path, data: Union[bytes, str]) -> bool:
+    """Écrit data (texte encodé en UTF-8) dans path sauf si le fichier contient déjà exactement ces octets"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    _write_raw(path, data)
+    return True
+
+
+def write_markdown(path: Path, template: str, **ctx) -> str:
+    """Écrit un guide ; le modèle n'est complété par format_map que si ctx est fourni"""
+    path.write_text(template.format_map(ctx) if ctx else template, encoding='utf-8')
+    return str(path)
+
+
+def write_json(path: Path, data) -> str:
+    """Écrit data en JSON indenté (2 espaces), UTF-8 sans échappement ASCII"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        # newline='' : fins de ligne \n sur toutes les plateformes, comme les octets d'orjson
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8', newline='')
+    return str(path)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registre des générateurs exécutés en groupe (data alerts, geoanalytics,
+inter-record functions, sélections, collaboration, visuels personnalisés,
+bookmarks) : un seul processus, générateurs lancés en parallèle, sorties
+sous un même répertoire racine.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from _common import ensure_output_dir, setup_console_logging
+import migrate_collaboration
+import migrate_custom_extensions
+import migrate_data_alerts
+import migrate_geoanalytics
+import migrate_inter_record_functions
+from migrate_bookmarks import BookmarkMigrator
+from migrate_current_selections import CurrentSelectionsGenerator
+
+logger = logging.getLogger(__name__)
+
+
+def _run_bookmarks(output_dir: Path, qvf: Path) -> str:
+    migrator = BookmarkMigrator(output_dir=output_dir)
+    output_file = output_dir / "bookmarks.json"
+    try:
+        count = migrator.write_bookmarks_json(qvf, output_file)
+    finally:
+        migrator.close()
+    migrator.generate_guide()
+    logger.info("✅ %d bookmarks extraits", count)
+    return str(output_file)
+
+
+def _run_selections(output_dir: Path) -> str:
+    generator = CurrentSelectionsGenerator(output_dir=output_dir)
+    generator.generate_dax_table()
+    generator.generate_guide()
+    return str(output_dir)
+
+
+# Nom → (générateur prenant le répertoire de sortie, sous-répertoire par défaut)
+GENERATORS: Dict[str, Tuple[Callable[[Path], object], str]] = {
+    "alerts": (migrate_data_alerts.generate_all, "data_alerts"),
+    "geo": (migrate_geoanalytics.gen_geo_guide, "geoanalytics"),
+    "inter_record": (migrate_inter_record_functions.gen_guide, "inter_record_functions"),
+    "selections": (_run_selections, "selections"),
+    "collaboration": (migrate_collaboration.gen_guide, "collaboration"),
+    "custom_visuals": (migrate_custom_extensions.generate_custom_visuals_guide, "custom_visuals"),
+}
+
+# Nom → (générateur prenant le répertoire de sortie et un QVF, sous-répertoire par défaut)
+QVF_GENERATORS: Dict[str, Tuple[Callable[[Path, Path], object], str]] = {
+    "bookmarks": (_run_bookmarks, "bookmarks"),
+}
+
+
+def run_all(root: Path = Path("output"), names: Optional[Iterable[str]] = None,
+            qvf: Optional[Path] = None) -> Dict[str, object]:
+    """Lance les générateurs demandés, sorties sous `root`.
+
+    Par défaut : tous ceux de GENERATORS, plus ceux de QVF_GENERATORS si un
+    QVF est fourni. Retourne le résultat de chaque générateur, indexé par nom.
+    """
+    if names is None:
+        names = list(GENERATORS) + (list(QVF_GENERATORS) if qvf is not None else [])
+
+    tasks = {}
+    for name in names:
+        if name in QVF_GENERATORS:
+            if qvf is None:
+                raise ValueError(f"Le générateur {name} nécessite un fichier QVF")
+            generator, subdir = QVF_GENERATORS[name]
+            args = (qvf,)
+        else:
+            generator, subdir = GENERATORS[name]
+            args = ()
+        tasks[name] = (generator, ensure_output_dir(root / subdir), args)
+
+    with ThreadPoolExecutor(max_workers=len(tasks) or 1) as pool:
+        futures = {name: pool.submit(generator, output_dir, *args)
+                   for name, (generator, output_dir, args) in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Génération groupée des guides et migrations (bookmarks si un QVF est fourni)")
+    parser.add_argument('qvf_file', type=Path, nargs='?', help="Fichier QVF (générateurs bookmarks)")
+    parser.add_argument('--output-dir', type=Path, default=Path('output'))
+    parser.add_argument('--only', nargs='+', choices=sorted({**GENERATORS, **QVF_GENERATORS}),
+                        help="Sous-ensemble de générateurs")
+    args = parser.parse_args()
+    if args.qvf_file is None and args.only and any(name in QVF_GENERATORS for name in args.only):
+        parser.error("un fichier QVF est requis pour : " + ", ".join(sorted(QVF_GENERATORS)))
+
+    setup_console_logging()
+
+    results = run_all(args.output_dir, args.only, args.qvf_file)
+
+    for name, result in results.items():
+        files = result if isinstance(result, tuple) else (result,)
+        for path in files:
+            logger.info("✅ %s: %s", name, path)
+    logger.info("📁 Fichiers dans : %s", args.output_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -7,61 +7,94 @@ Author: Migration Team
 Date: 2026-02-13
 """
 
-import json
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import argparse
+from dataclasses import dataclass
+
+from _common import json_array_end, json_array_item, write_if_changed
+
+
+_AGGR_RE = re.compile(r'Aggr\((.*?),\s*(.+?)\)$')
+_RANGESUM_RE = re.compile(r'RangeSum\(\$(\d+):\$\((.+?)\)\)')
+
+# Templates DAX pour Aggr(<inner>, <dim>)
+_SUMX_TMPL = 'SUMX(VALUES({dim}), [{field}])'
+_COUNTX_TMPL = 'COUNTX(VALUES({dim}), 1)'
+_AVERAGEX_TMPL = 'AVERAGEX(VALUES({dim}), [{field}])'
+
+# Agrégation interne Qlik → (template DAX, confiance)
+_AGGR_DISPATCH = {
+    'Sum': (_SUMX_TMPL, 85),
+    'Count': (_COUNTX_TMPL, 80),
+    'Avg': (_AVERAGEX_TMPL, 85),
+}
+
+
+def _has_at_least_two(text: str, sub: str) -> bool:
+    """Vrai si sub apparaît au moins deux fois (arrêt dès la 2e occurrence)."""
+    first = text.find(sub)
+    return first >= 0 and text.find(sub, first + len(sub)) >= 0
+
+
+@dataclass(frozen=True, slots=True)
+class AggPattern:
+    """Pattern de conversion Qlik → DAX documenté."""
+    qlik: str
+    dax: str
+    confidence: int
+    example: str
 
 
 class AdvancedAggregationConverter:
     """Convertit les agrégations Qlik avancées en DAX."""
     
-    def __init__(self):
-        self.conversion_patterns = {
-            # Agrégations hiérarchiques
-            'hierarchy': {
-                'qlik': r'Aggr\(Sum\(\$(Field)\), \$(Dimension)\)',
-                'dax': 'SUMX({0}, {1})',
-                'confidence': 85,
-                'example': 'Aggr(Sum(Sales), Region) → SUMX(VALUES(Region), [Sales Measure])'
-            },
-            # Agrégations sur partitions
-            'partition': {
-                'qlik': r'Sum\(\$\(expr\)\) / Sum\(Total \$\(expr\)\)',
-                'dax': '{0} / CALCULATE({0}, ALL({1}))',
-                'confidence': 90,
-                'example': 'Sum(Sales) / Sum(Total Sales) → Measure / ALL Measure'
-            },
-            # Agrégations avec conditions
-            'conditional': {
-                'qlik': r'Sum\(If\(condition, \$\(expr\), 0\)\)',
-                'dax': 'SUMX(FILTER({0}, condition), {1})',
-                'confidence': 80,
-                'example': 'Sum(If(Region="North", Sales, 0)) → SUMX(FILTER, [Measure])'
-            },
-            # Agrégations cumulées
-            'running_total': {
-                'qlik': r'RangeSum\(\$1:\$\(Index\)\)',
-                'dax': 'CALCULATE({0}, ALL(Date), Date <= MAX(Date))',
-                'confidence': 85,
-                'example': 'RangeSum($1:$n) → CALCULATE with Date filter'
-            },
-            # Moyennes mobiles
-            'moving_average': {
-                'qlik': r'Avg\(Range\)',
-                'dax': 'AVERAGEX(OFFSET, {0})',
-                'confidence': 75,
-                'example': 'Moving average → OFFSET + AVERAGEX'
-            },
-            # Agrégations multi-niveaux
-            'multi_level': {
-                'qlik': r'Aggr\(Aggr\(...\), ...\)',
-                'dax': 'SUMX(VALUES(...), CALCULATE({0}, {1}))',
-                'confidence': 70,
-                'example': 'Nested Aggr → SUMX with nested CALCULATE'
-            }
-        }
+    # Patterns de conversion documentés, partagés par toutes les instances
+    CONVERSION_PATTERNS = {
+        # Agrégations hiérarchiques
+        'hierarchy': AggPattern(
+            qlik=r'Aggr\(Sum\(\$(Field)\), \$(Dimension)\)',
+            dax='SUMX({0}, {1})',
+            confidence=85,
+            example='Aggr(Sum(Sales), Region) → SUMX(VALUES(Region), [Sales Measure])',
+        ),
+        # Agrégations sur partitions
+        'partition': AggPattern(
+            qlik=r'Sum\(\$\(expr\)\) / Sum\(Total \$\(expr\)\)',
+            dax='{0} / CALCULATE({0}, ALL({1}))',
+            confidence=90,
+            example='Sum(Sales) / Sum(Total Sales) → Measure / ALL Measure',
+        ),
+        # Agrégations avec conditions
+        'conditional': AggPattern(
+            qlik=r'Sum\(If\(condition, \$\(expr\), 0\)\)',
+            dax='SUMX(FILTER({0}, condition), {1})',
+            confidence=80,
+            example='Sum(If(Region="North", Sales, 0)) → SUMX(FILTER, [Measure])',
+        ),
+        # Agrégations cumulées
+        'running_total': AggPattern(
+            qlik=r'RangeSum\(\$1:\$\(Index\)\)',
+            dax='CALCULATE({0}, ALL(Date), Date <= MAX(Date))',
+            confidence=85,
+            example='RangeSum($1:$n) → CALCULATE with Date filter',
+        ),
+        # Moyennes mobiles
+        'moving_average': AggPattern(
+            qlik=r'Avg\(Range\)',
+            dax='AVERAGEX(OFFSET, {0})',
+            confidence=75,
+            example='Moving average → OFFSET + AVERAGEX',
+        ),
+        # Agrégations multi-niveaux
+        'multi_level': AggPattern(
+            qlik=r'Aggr\(Aggr\(...\), ...\)',
+            dax='SUMX(VALUES(...), CALCULATE({0}, {1}))',
+            confidence=70,
+            example='Nested Aggr → SUMX with nested CALCULATE',
+        )
+    }
     
     def convert_aggr_function(self, expression: str) -> Dict:
         """
@@ -82,7 +115,7 @@ class AdvancedAggregationConverter:
         }
         
         # Parser expression Aggr
-        aggr_match = re.search(r'Aggr\((.*?),\s*(.+?)\)$', expression)
+        aggr_match = _AGGR_RE.search(expression)
         if not aggr_match:
             result['notes'].append("Impossible de parser Aggr()")
             return result
@@ -91,17 +124,14 @@ class AdvancedAggregationConverter:
         dimension = aggr_match.group(2)
         
         # Détecter le type d'agrégation interne
-        if inner_expr.startswith('Sum'):
-            result['dax'] = f"SUMX(VALUES({dimension}), [{inner_expr.replace('Sum(', '').replace(')', '')}])"
-            result['confidence'] = 85
-        elif inner_expr.startswith('Count'):
-            result['dax'] = f"COUNTX(VALUES({dimension}), 1)"
-            result['confidence'] = 80
-        elif inner_expr.startswith('Avg'):
-            result['dax'] = f"AVERAGEX(VALUES({dimension}), [{inner_expr.replace('Avg(', '').replace(')', '')}])"
-            result['confidence'] = 85
+        prefix = next((p for p in _AGGR_DISPATCH if inner_expr.startswith(p)), None)
+        if prefix:
+            template, confidence = _AGGR_DISPATCH[prefix]
+            inner_field = inner_expr[len(prefix):].removeprefix('(').removesuffix(')')
+            result['dax'] = template.format(dim=dimension, field=inner_field)
+            result['confidence'] = confidence
         else:
-            result['dax'] = f"SUMX(VALUES({dimension}), [{inner_expr}])"
+            result['dax'] = _SUMX_TMPL.format(dim=dimension, field=inner_expr)
             result['confidence'] = 70
             result['notes'].append("Expression personnalisée - vérifier DAX généré")
         
@@ -117,7 +147,7 @@ class AdvancedAggregationConverter:
         }
         
         # Parser RangeSum
-        rangesum_match = re.search(r'RangeSum\(\$(\d+):\$\((.+?)\)\)', expression)
+        rangesum_match = _RANGESUM_RE.search(expression)
         if rangesum_match:
             start = rangesum_match.group(1)
             field = rangesum_match.group(2)
@@ -131,13 +161,19 @@ Running_Total =
         'Date'[Date] <= MAX('Date'[Date])
     )
 """
-            result['confidence'] = 85
+            result['confidence'] = self.CONVERSION_PATTERNS['running_total'].confidence
             result['notes'].append("Nécessite colonne Date triée")
         
         return result
     
-    def convert_multi_level_aggr(self, expression: str) -> Dict:
-        """Convertit aggégations imbriquées."""
+    def convert_multi_level_aggr(self, expression: str, nested_count: Optional[int] = None) -> Dict:
+        """
+        Convertit aggégations imbriquées.
+        
+        Args:
+            expression: Expression Qlik avec Aggr() imbriqués
+            nested_count: Nombre de 'Aggr(' déjà compté par l'appelant
+        """
         result = {
             "original": expression,
             "dax": "",
@@ -146,9 +182,12 @@ Running_Total =
         }
         
         # Détecter agrégations imbriquées
-        nested_count = expression.count('Aggr(')
+        if nested_count is None:
+            is_nested = _has_at_least_two(expression, 'Aggr(')
+        else:
+            is_nested = nested_count >= 2
         
-        if nested_count >= 2:
+        if is_nested:
             result['dax'] = """
 -- Agrégation multi-niveaux
 SUMX(
@@ -159,18 +198,14 @@ SUMX(
     )
 )
 """
-            result['confidence'] = 70
+            result['confidence'] = self.CONVERSION_PATTERNS['multi_level'].confidence
             result['notes'].append("Vérifier logique imbrication")
             result['notes'].append("Peut nécessiter restructuration modèle")
         
         return result
 
 
-def generate_advanced_aggregations_guide(output_dir: Path) -> str:
-    """Génère un guide des agrégations avancées."""
-    guide_path = output_dir / "ADVANCED_AGGREGATIONS_GUIDE.md"
-    
-    guide_content = """# 📊 Guide Agrégations Avancées - Qlik vers DAX
+_GUIDE_CONTENT = """# 📊 Guide Agrégations Avancées - Qlik vers DAX
 
 **Date de génération :** 13 février 2026
 
@@ -459,18 +494,18 @@ Measure_Pct_2025 =
 
 **✨ Guide généré automatiquement par migrate_advanced_aggregations.py**
 """
+
+
+def generate_advanced_aggregations_guide(output_dir: Path) -> str:
+    """Génère un guide des agrégations avancées."""
+    guide_path = output_dir / "ADVANCED_AGGREGATIONS_GUIDE.md"
     
-    with open(guide_path, 'w', encoding='utf-8') as f:
-        f.write(guide_content)
+    write_if_changed(guide_path, _GUIDE_CONTENT)
     
     return str(guide_path)
 
 
-def generate_conversion_templates(output_dir: Path) -> str:
-    """Génère des templates de conversion."""
-    template_path = output_dir / "aggregation_templates.dax"
-    
-    templates = """-- Templates de Conversion Agrégations Avancées
+_TEMPLATES_CONTENT = """-- Templates de Conversion Agrégations Avancées
 
 -- ============================================
 -- 1. TEMPLATE: Aggr() Simple
@@ -681,9 +716,13 @@ Rolling_7Day_Avg =
         [Daily_Measure]
     )
 """
+
+
+def generate_conversion_templates(output_dir: Path) -> str:
+    """Génère des templates de conversion."""
+    template_path = output_dir / "aggregation_templates.dax"
     
-    with open(template_path, 'w', encoding='utf-8') as f:
-        f.write(templates)
+    write_if_changed(template_path, _TEMPLATES_CONTENT)
     
     return str(template_path)
 
@@ -737,32 +776,31 @@ def main():
             with open(args.file) as f:
                 expressions.extend([line.strip() for line in f if line.strip()])
         
-        conversions = []
-        for expr in expressions:
-            print(f"\n🔄 Conversion: {expr}")
-            
-            if 'Aggr' in expr:
-                result = converter.convert_aggr_function(expr)
-            elif 'RangeSum' in expr:
-                result = converter.convert_running_total(expr)
-            elif 'Aggr' in expr and expr.count('Aggr') > 1:
-                result = converter.convert_multi_level_aggr(expr)
-            else:
-                result = {
-                    "original": expr,
-                    "dax": "-- Conversion personnalisée requise",
-                    "confidence": 50,
-                    "notes": ["Expression non reconnue - revoir manuellement"]
-                }
-            
-            conversions.append(result)
-            print(f"  DAX: {result['dax'][:60]}...")
-            print(f"  Confiance: {result['confidence']}%")
-        
-        # Sauvegarder conversions
+        # Sauvegarder conversions au fil de l'eau (tableau JSON, mis en forme comme json.dump(indent=2))
         conv_file = output_dir / "conversions.json"
-        with open(conv_file, 'w') as f:
-            json.dump(conversions, f, indent=2)
+        with open(conv_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            for count, expr in enumerate(expressions, 1):
+                print(f"\n🔄 Conversion: {expr}")
+                
+                aggr_count = expr.count('Aggr(')
+                if aggr_count >= 2:
+                    result = converter.convert_multi_level_aggr(expr, aggr_count)
+                elif aggr_count == 1:
+                    result = converter.convert_aggr_function(expr)
+                elif 'RangeSum' in expr:
+                    result = converter.convert_running_total(expr)
+                else:
+                    result = {
+                        "original": expr,
+                        "dax": "-- Conversion personnalisée requise",
+                        "confidence": 50,
+                        "notes": ["Expression non reconnue - revoir manuellement"]
+                    }
+                
+                f.write(json_array_item(result, count == 1, depth=0))
+                print(f"  DAX: {result['dax'][:60]}...")
+                print(f"  Confiance: {result['confidence']}%")
+            f.write(json_array_end(len(expressions), depth=0))
         print(f"\n✅ Conversions: {conv_file}")
     
     print(f"\n📚 Ressources générées:")
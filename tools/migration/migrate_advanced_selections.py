@@ -58,7 +58,7 @@ Power BI filters natifs avec search:
 
 **Effort :** 3-5 jours | **Complexité :** Basique-Moyenne
 """
-    with open(path, 'w') as f: f.write(content)
+    path.write_text(content, encoding='utf-8')
     return str(path)
 
 def main():
@@ -59,8 +59,7 @@ IF(
 
 **Effort :** 2-3 jours | **Complexité :** Moyenne
 """
-    with open(guide_path, 'w') as f:
-        f.write(content)
+    guide_path.write_text(content, encoding='utf-8')
     return str(guide_path)
 
 def main():
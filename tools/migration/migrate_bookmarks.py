@@ -4,14 +4,48 @@
 Migration des Bookmarks Qlik vers Signets Power BI
 """
 
+import glob
+import io
 import json
+import logging
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional
 from dataclasses import dataclass, field
 
+from _common import EMPTY, call_captured, loads, setup_console_logging, write_if_changed
 
-@dataclass
+try:
+    import ijson  # Parseur JSON incrémental (optionnel)
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Sérialiseur JSON natif (optionnel)
+except ImportError:
+    orjson = None
+
+try:
+    import ujson  # Repli natif si orjson est absent (optionnel)
+except ImportError:
+    ujson = None
+
+# Taille des tampons d'E/S (lecture du membre zip, écriture JSON)
+_READ_BUFFER_SIZE = 1 << 20
+_WRITE_BUFFER_SIZE = 1 << 20
+
+logger = logging.getLogger(__name__)
+
+# Membres QVF contenant un bookmark chacun (évite de parser app.json)
+_BOOKMARK_MEMBER_PREFIX = 'appprops/bookmarks/'
+
+# Valeurs par défaut partagées des lectures .get() : immuables, jamais à muter
+_EMPTY_LIST = ()
+
+
+@dataclass(slots=True)
 class QlikBookmark:
     """Bookmark Qlik"""
     id: str
@@ -21,7 +55,7 @@ class QlikBookmark:
     sheet_id: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class PowerBIBookmark:
     """Signet Power BI"""
     name: str
@@ -31,45 +65,49 @@ class PowerBIBookmark:
     visual_states: List[Dict] = field(default_factory=list)
 
 
-class BookmarkMigrator:
-    """Migration bookmarks Qlik → Power BI"""
-    
-    def __init__(self, output_dir: Path = None):
-        self.output_dir = output_dir or Path('output/bookmarks')
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        
-    def extract_bookmarks(self, qvf_path: Path) -> List[QlikBookmark]:
-        """Extrait les bookmarks d'un QVF"""
-        print(f"🔖 Extraction bookmarks depuis : {qvf_path}")
-        
-        bookmarks = []
-        try:
-            with zipfile.ZipFile(qvf_path, 'r') as qvf:
-                if 'app.json' in qvf.namelist():
-                    app_data = json.loads(qvf.read('app.json').decode('utf-8'))
-                    
-                    # Chercher bookmarks
-                    if 'properties' in app_data and 'qBookmarkList' in app_data['properties']:
-                        for bm in app_data['properties']['qBookmarkList']:
-                            bookmark = QlikBookmark(
-                                id=bm.get('qId', ''),
-                                name=bm.get('qMetaDef', {}).get('title', 'Untitled'),
-                                description=bm.get('qMetaDef', {}).get('description', ''),
-                                selections=bm.get('qBookmark', {}).get('qStateData', [])
-                            )
-                            bookmarks.append(bookmark)
-            
-            print(f"✅ {len(bookmarks)} bookmarks trouvés")
-        except Exception as e:
-            print(f"❌ Erreur : {e}")
-        
-        return bookmarks
-    
-    def generate_guide(self) -> str:
-        """Génère guide de migration bookmarks"""
-        guide_file = self.output_dir / "BOOKMARK_MIGRATION_GUIDE.md"
-        
-        guide = """# Migration Bookmarks Qlik → Signets Power BI
+# Champs exportés (sheet_id reste interne)
+_EXPORT_FIELDS = ('id', 'name', 'description', 'selections')
+_export_values = attrgetter(*_EXPORT_FIELDS)
+
+
+def _bookmark_record(bookmark: QlikBookmark) -> Dict:
+    """Représentation exportée d'un bookmark"""
+    return dict(zip(_EXPORT_FIELDS, _export_values(bookmark)))
+
+
+def _json_line(record: Dict) -> bytes:
+    """Sérialise un enregistrement en une ligne JSON (UTF-8)"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _dump_bookmarks_json(bookmarks: Iterable[QlikBookmark], output_file: Path) -> int:
+    """Écrit des bookmarks dans un tableau JSON indenté ; retourne leur nombre"""
+    payload = [_bookmark_record(b) for b in bookmarks]
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    elif ujson is not None:
+        output_file.write_bytes(
+            ujson.dumps(payload, ensure_ascii=False, indent=2, escape_forward_slashes=False).encode('utf-8')
+        )
+    else:
+        with output_file.open('w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+    return len(payload)
+
+
+def _dump_bookmarks_ndjson(bookmarks: Iterable[QlikBookmark], output_file: Path) -> int:
+    """Écrit des bookmarks en JSON Lines, au fil de l'itération ; retourne leur nombre"""
+    count = 0
+    with output_file.open('wb', buffering=_WRITE_BUFFER_SIZE) as f:
+        for bookmark in bookmarks:
+            f.write(_json_line(_bookmark_record(bookmark)))
+            count += 1
+    return count
+
+
+_BOOKMARK_GUIDE_TEXT = """# Migration Bookmarks Qlik → Signets Power BI
 
 ## Conversion
 
@@ -112,36 +150,199 @@ Pour chaque bookmark :
 - Différences de comportement entre Qlik et Power BI
 
 """
+_BOOKMARK_GUIDE_BYTES = _BOOKMARK_GUIDE_TEXT.encode('utf-8')
+
+
+class BookmarkMigrator:
+    """Migration bookmarks Qlik → Power BI"""
+    
+    def __init__(self, output_dir: Path = None):
+        self.output_dir = output_dir or Path('output/bookmarks')
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Archives QVF ouvertes (répertoire central lu une seule fois)
+        self._qvf_cache: Dict[Path, zipfile.ZipFile] = {}
+        self._qvf_names: Dict[Path, set] = {}
+        self._qvf_bookmark_members: Dict[Path, List[str]] = {}
+    
+    def _open_qvf(self, qvf_path: Path) -> zipfile.ZipFile:
+        """Retourne l'archive QVF, ouverte au premier appel puis réutilisée"""
+        qvf = self._qvf_cache.get(qvf_path)
+        if qvf is None:
+            qvf = zipfile.ZipFile(qvf_path, 'r')
+            self._qvf_cache[qvf_path] = qvf
+            names = qvf.namelist()
+            self._qvf_names[qvf_path] = set(names)
+            self._qvf_bookmark_members[qvf_path] = sorted(
+                n for n in names
+                if n.startswith(_BOOKMARK_MEMBER_PREFIX) and n.endswith('.json')
+            )
+        return qvf
+    
+    def close(self):
+        """Ferme les archives QVF gardées en cache"""
+        for qvf in self._qvf_cache.values():
+            qvf.close()
+        self._qvf_cache.clear()
+        self._qvf_names.clear()
+        self._qvf_bookmark_members.clear()
+        
+    def iter_bookmarks(self, qvf_path: Path) -> Iterator[QlikBookmark]:
+        """Produit les bookmarks d'un QVF.
         
-        guide_file.write_text(guide, encoding='utf-8')
-        print(f"✅ Guide généré : {guide_file}")
-        return guide
+        Les membres appprops/bookmarks/*.json sont lus en priorité ; app.json
+        n'est parsé (en flux) qu'en leur absence.
+        """
+        qvf = self._open_qvf(qvf_path)
+        members = self._qvf_bookmark_members[qvf_path]
+        if members:
+            yield from self._to_bookmarks(loads(qvf.read(name)) for name in members)
+            return
+        if 'app.json' not in self._qvf_names[qvf_path]:
+            return
+        with io.BufferedReader(qvf.open('app.json'), buffer_size=_READ_BUFFER_SIZE) as fp:
+            yield from self._to_bookmarks(self._iter_bookmark_items(fp))
+    
+    @staticmethod
+    def _to_bookmarks(items: Iterator[Dict]) -> Iterator[QlikBookmark]:
+        """Convertit des définitions brutes en QlikBookmark"""
+        for bm in items:
+            # qMetaDef / qBookmark lus une seule fois, null toléré
+            meta = bm.get('qMetaDef') or EMPTY
+            yield QlikBookmark(
+                id=bm.get('qId', ''),
+                name=meta.get('title', 'Untitled'),
+                description=meta.get('description', ''),
+                selections=(bm.get('qBookmark') or EMPTY).get('qStateData', _EMPTY_LIST)
+            )
+    
+    def extract_bookmarks(self, qvf_path: Path) -> List[QlikBookmark]:
+        """Extrait les bookmarks d'un QVF"""
+        logger.info("🔖 Extraction bookmarks depuis : %s", qvf_path)
+        
+        bookmarks = []
+        try:
+            bookmarks.extend(self.iter_bookmarks(qvf_path))
+            logger.info("✅ %d bookmarks trouvés", len(bookmarks))
+        except Exception as e:
+            logger.error("❌ Erreur : %s", e)
+        
+        return bookmarks
+    
+    def extract_bookmarks_batch(self, qvf_paths: List[Path],
+                                max_workers: Optional[int] = None) -> Dict[Path, List[QlikBookmark]]:
+        """Extrait les bookmarks de plusieurs QVF en parallèle (un processus par fichier).
+        
+        Le parsing JSON et la décompression restent liés au GIL : les processus
+        passent à l'échelle avec le nombre de cœurs, contrairement aux threads.
+        """
+        results: Dict[Path, List[QlikBookmark]] = {}
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {path: pool.submit(call_captured, _extract_in_worker, self.output_dir, path)
+                       for path in qvf_paths}
+            for path, future in futures.items():
+                try:
+                    results[path], output = future.result()
+                except Exception as e:
+                    logger.error("❌ Erreur (%s) : %s", path, e)
+                    results[path] = []
+                    continue
+                # Journalisation côté parent, dans l'ordre des fichiers
+                if output:
+                    logger.info("%s", output.rstrip('\n'))
+        return results
+    
+    def write_bookmarks_json(self, qvf_path: Path, output_file: Path) -> int:
+        """Écrit les bookmarks dans un tableau JSON indenté.
+        
+        Retourne le nombre de bookmarks écrits.
+        """
+        return _dump_bookmarks_json(self.extract_bookmarks(qvf_path), output_file)
+    
+    def write_bookmarks_ndjson(self, qvf_path: Path, output_file: Path) -> int:
+        """Écrit les bookmarks en JSON Lines au fil de l'extraction.
+        
+        La mémoire reste bornée à un bookmark, quel que soit leur nombre.
+        Retourne le nombre de bookmarks écrits.
+        """
+        logger.info("🔖 Extraction bookmarks depuis : %s", qvf_path)
+        
+        count = 0
+        try:
+            count = _dump_bookmarks_ndjson(self.iter_bookmarks(qvf_path), output_file)
+            logger.info("✅ %d bookmarks trouvés", count)
+        except Exception as e:
+            logger.error("❌ Erreur : %s", e)
+        
+        return count
+    
+    @staticmethod
+    def _iter_bookmark_items(fp):
+        """Itère sur properties.qBookmarkList d'un app.json ouvert en binaire.
+        
+        Avec ijson, seul le sous-arbre des bookmarks est matérialisé ;
+        sinon le document complet est chargé depuis ses octets (orjson si
+        disponible, sans passer par une chaîne décodée).
+        """
+        if ijson is not None:
+            yield from ijson.items(fp, 'properties.qBookmarkList.item', use_float=True)
+            return
+        app_data = loads(fp.read())
+        yield from (app_data.get('properties') or EMPTY).get('qBookmarkList') or _EMPTY_LIST
+    
+    def generate_guide(self) -> str:
+        """Génère guide de migration bookmarks"""
+        guide_file = self.output_dir / "BOOKMARK_MIGRATION_GUIDE.md"
+        write_if_changed(guide_file, _BOOKMARK_GUIDE_BYTES)
+        logger.info("✅ Guide généré : %s", guide_file)
+        return _BOOKMARK_GUIDE_TEXT
+
+
+def _extract_in_worker(output_dir: Path, qvf_path: Path) -> List[QlikBookmark]:
+    """Extraction dans un processus de ProcessPoolExecutor, via call_captured
+    (archive ouverte et fermée sur place)"""
+    migrator = BookmarkMigrator(output_dir=output_dir)
+    try:
+        return migrator.extract_bookmarks(qvf_path)
+    finally:
+        migrator.close()
 
 
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Migration Bookmarks Qlik")
-    parser.add_argument('qvf_file', type=Path)
+    parser.add_argument('qvf_file', type=Path, nargs='?')
+    parser.add_argument('--batch', metavar='GLOB',
+                        help="Motif de fichiers QVF traités en parallèle (sorties dans <output-dir>/<nom du QVF>/)")
     parser.add_argument('--output-dir', type=Path, default=Path('output/bookmarks'))
+    parser.add_argument('--format', choices=('json', 'ndjson'), default='json',
+                        help="json : tableau unique ; ndjson : une ligne par bookmark, écrite en flux")
     args = parser.parse_args()
+    if (args.qvf_file is None) == (args.batch is None):
+        parser.error("indiquer soit un fichier QVF, soit --batch")
+    
+    setup_console_logging()
     
     migrator = BookmarkMigrator(output_dir=args.output_dir)
-    bookmarks = migrator.extract_bookmarks(args.qvf_file)
     
     # Sauvegarder
-    output_file = args.output_dir / "bookmarks.json"
-    with output_file.open('w', encoding='utf-8') as f:
-        json.dump([{
-            'id': b.id,
-            'name': b.name,
-            'description': b.description,
-            'selections': b.selections
-        } for b in bookmarks], f, indent=2, ensure_ascii=False)
+    if args.batch is not None:
+        dump = _dump_bookmarks_ndjson if args.format == 'ndjson' else _dump_bookmarks_json
+        results = migrator.extract_bookmarks_batch(sorted(Path(p) for p in glob.glob(args.batch)))
+        count = 0
+        for qvf_path, bookmarks in results.items():
+            qvf_dir = args.output_dir / qvf_path.stem
+            qvf_dir.mkdir(parents=True, exist_ok=True)
+            count += dump(bookmarks, qvf_dir / f"bookmarks.{args.format}")
+    elif args.format == 'ndjson':
+        count = migrator.write_bookmarks_ndjson(args.qvf_file, args.output_dir / "bookmarks.ndjson")
+    else:
+        count = migrator.write_bookmarks_json(args.qvf_file, args.output_dir / "bookmarks.json")
     
+    migrator.close()
     migrator.generate_guide()
     
-    print(f"\n✅ {len(bookmarks)} bookmarks extraits")
-    print(f"📁 Fichiers dans : {args.output_dir}")
+    logger.info("\n✅ %d bookmarks extraits", count)
+    logger.info("📁 Fichiers dans : %s", args.output_dir)
     return 0
 
 
@@ -1,8 +1,14 @@
 """Migration - Collaboration Objects (Annotations, Discussions) vers Power BI Comments"""
-import json; from pathlib import Path
-def gen_guide(output_dir: Path) -> str:
-    path = output_dir / "COLLABORATION_MIGRATION_GUIDE.md"
-    content = """# 💬 Guide Migration - Collaboration Objects vers Power BI Comments & Teams
+import logging
+import sys
+from pathlib import Path
+
+from _common import setup_console_logging, write_if_changed
+
+logger = logging.getLogger(__name__)
+
+
+_COLLAB_GUIDE_TEXT = """# 💬 Guide Migration - Collaboration Objects vers Power BI Comments & Teams
 
 **Date :** 13 février 2026
 
@@ -61,14 +67,20 @@ Power BI: App (published, shared workspace)
 
 **Effort :** 1-2 semaines | **Complexité :** Basique
 """
-    with open(path, 'w') as f: f.write(content)
+_COLLAB_GUIDE_BYTES = _COLLAB_GUIDE_TEXT.encode('utf-8')
+
+
+def gen_guide(output_dir: Path) -> str:
+    path = output_dir / "COLLABORATION_MIGRATION_GUIDE.md"
+    write_if_changed(path, _COLLAB_GUIDE_BYTES)
     return str(path)
 
 def main():
+    setup_console_logging()
     output_dir = Path("output/collaboration")
     output_dir.mkdir(parents=True, exist_ok=True)
-    print(f"✅ Collaboration: {gen_guide(output_dir)}")
+    logger.info("✅ Collaboration: %s", gen_guide(output_dir))
     return 0
 
 if __name__ == "__main__":
-    import sys; sys.exit(main())
+    sys.exit(main())
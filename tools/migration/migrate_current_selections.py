@@ -6,50 +6,14 @@ Crée un visuel de filtres actifs similaire à Qlik
 """
 
 from pathlib import Path
-import json
+import logging
 
+from _common import setup_console_logging, write_if_changed
 
-class CurrentSelectionsGenerator:
-    """Génère configuration pour barre de sélections actives"""
-    
-    def __init__(self, output_dir: Path = None):
-        self.output_dir = output_dir or Path('output/selections')
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-    
-    def generate_dax_table(self, fields: list = None) -> str:
-        """Génère table DAX pour afficher sélections"""
-        
-        if not fields:
-            fields = ['Date', 'Product', 'Region', 'Customer']
-        
-        dax = """// Table DAX pour Current Selections
-// Crée une table calculée affichant les filtres actifs
+logger = logging.getLogger(__name__)
 
-Current Selections = 
-UNION(
-"""
-        
-        for i, field in enumerate(fields):
-            dax += f"""    SELECTCOLUMNS(
-        DISTINCT({field}[{field}]),
-        "Field", "{field}",
-        "Value", {field}[{field}]
-    )"""
-            if i < len(fields) - 1:
-                dax += ",\n"
-        
-        dax += "\n)\n"
-        
-        output_file = self.output_dir / "current_selections.dax"
-        output_file.write_text(dax, encoding='utf-8')
-        print(f"✅ Table DAX : {output_file}")
-        
-        return dax
-    
-    def generate_guide(self) -> str:
-        """Génère guide de création"""
-        
-        guide = """# Current Selections - Barre de Filtres Actifs
+
+_SELECTIONS_GUIDE_TEXT = """# Current Selections - Barre de Filtres Actifs
 
 ## Équivalent Qlik → Power BI
 
@@ -169,12 +133,53 @@ UNION(
 
 **✨ Fichiers générés dans :** `output/selections/`
 """
+_SELECTIONS_GUIDE_BYTES = _SELECTIONS_GUIDE_TEXT.encode('utf-8')
+
+
+_DAX_HEADER = """// Table DAX pour Current Selections
+// Crée une table calculée affichant les filtres actifs
+
+Current Selections = 
+UNION(
+"""
+
+
+class CurrentSelectionsGenerator:
+    """Génère configuration pour barre de sélections actives"""
+    
+    def __init__(self, output_dir: Path = None):
+        self.output_dir = output_dir or Path('output/selections')
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+    
+    def generate_dax_table(self, fields: list = None) -> str:
+        """Génère table DAX pour afficher sélections"""
         
+        if not fields:
+            fields = ['Date', 'Product', 'Region', 'Customer']
+        
+        parts = [
+            f"""    SELECTCOLUMNS(
+        DISTINCT({field}[{field}]),
+        "Field", "{field}",
+        "Value", {field}[{field}]
+    )"""
+            for field in fields
+        ]
+        dax = _DAX_HEADER + ",\n".join(parts) + "\n)\n"
+        
+        output_file = self.output_dir / "current_selections.dax"
+        output_file.write_text(dax, encoding='utf-8')
+        logger.info("✅ Table DAX : %s", output_file)
+        
+        return dax
+    
+    def generate_guide(self) -> str:
+        """Génère guide de création"""
         guide_file = self.output_dir / "CURRENT_SELECTIONS_GUIDE.md"
-        guide_file.write_text(guide, encoding='utf-8')
-        print(f"✅ Guide : {guide_file}")
+        write_if_changed(guide_file, _SELECTIONS_GUIDE_BYTES)
+        logger.info("✅ Guide : %s", guide_file)
         
-        return guide
+        return _SELECTIONS_GUIDE_TEXT
 
 
 def main():
@@ -185,21 +190,23 @@ def main():
     parser.add_argument('--output-dir', type=Path, default=Path('output/selections'))
     args = parser.parse_args()
     
-    print("🔍 Générateur Current Selections\n")
-    print("=" * 60)
+    setup_console_logging()
+    
+    logger.info("🔍 Générateur Current Selections\n")
+    logger.info("=" * 60)
     
     generator = CurrentSelectionsGenerator(output_dir=args.output_dir)
     
     # Génération
-    print("\n📝 Génération des fichiers...")
+    logger.info("\n📝 Génération des fichiers...")
     generator.generate_dax_table(fields=args.fields)
     generator.generate_guide()
     
     # Résumé
-    print("\n" + "=" * 60)
-    print("✅ Génération terminée !")
-    print(f"📁 Fichiers dans : {args.output_dir}")
-    print("\n💡 Consultez CURRENT_SELECTIONS_GUIDE.md pour les options")
+    logger.info("\n" + "=" * 60)
+    logger.info("✅ Génération terminée !")
+    logger.info("📁 Fichiers dans : %s", args.output_dir)
+    logger.info("\n💡 Consultez CURRENT_SELECTIONS_GUIDE.md pour les options")
     
     return 0
 
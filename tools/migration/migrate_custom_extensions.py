@@ -1,9 +1,14 @@
 """Migration - Custom Extensions vers Power BI Custom Visuals"""
-import json
+import logging
+import sys
 from pathlib import Path
-def generate_custom_visuals_guide(output_dir: Path) -> str:
-    guide_path = output_dir / "CUSTOM_VISUALS_MIGRATION_GUIDE.md"
-    content = """# 🎨 Guide Migration - Qlik Extensions vers Custom Visuals Power BI
+
+from _common import setup_console_logging, write_if_changed
+
+logger = logging.getLogger(__name__)
+
+
+_CUSTOM_VISUALS_GUIDE_TEXT = """# 🎨 Guide Migration - Qlik Extensions vers Custom Visuals Power BI
 
 **Date :** 13 février 2026
 
@@ -66,16 +71,21 @@ Evaluater: Custom Qlik extension VRAIMENT nécessaire?
 
 **Effort :** 2-10 semaines | **Complexité :** Moyenne-Élevée
 """
-    with open(guide_path, 'w') as f:
-        f.write(content)
+_CUSTOM_VISUALS_GUIDE_BYTES = _CUSTOM_VISUALS_GUIDE_TEXT.encode('utf-8')
+
+
+def generate_custom_visuals_guide(output_dir: Path) -> str:
+    guide_path = output_dir / "CUSTOM_VISUALS_MIGRATION_GUIDE.md"
+    write_if_changed(guide_path, _CUSTOM_VISUALS_GUIDE_BYTES)
     return str(guide_path)
 
 def main():
+    setup_console_logging()
     output_dir = Path("output/custom_visuals")
     output_dir.mkdir(parents=True, exist_ok=True)
     guide_file = generate_custom_visuals_guide(output_dir)
-    print(f"✅ Custom Visuals guide: {guide_file}")
+    logger.info("✅ Custom Visuals guide: %s", guide_file)
     return 0
 
 if __name__ == "__main__":
-    import sys; sys.exit(main())
+    sys.exit(main())
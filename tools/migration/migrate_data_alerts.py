@@ -7,17 +7,31 @@ Author: Migration Team
 Date: 2026-02-13
 """
 
-import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
-import argparse
+from typing import Dict, Tuple
 
+try:
+    import orjson  # Sérialiseur JSON natif (optionnel)
+except ImportError:
+    orjson = None
 
-def generate_alerts_migration_guide(output_dir: Path) -> str:
-    """Génère un guide complet de migration des alertes."""
-    guide_path = output_dir / "ALERTS_MIGRATION_GUIDE.md"
-    
-    guide_content = """# 📢 Guide Migration - Data Alerts Qlik vers Power BI
+from _common import ensure_output_dir, write_if_changed
+
+
+def _json_bytes(data: Dict, compact: bool = False) -> bytes:
+    """Sérialise data en JSON (UTF-8), indenté sauf si compact"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, option=option)
+    import json
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# Guide découpé par section : chaque fragment se modifie isolément
+_ALERTS_GUIDE_HEADER = """# 📢 Guide Migration - Data Alerts Qlik vers Power BI
 
 **Date de génération :** 13 février 2026
 
@@ -38,7 +52,9 @@ def generate_alerts_migration_guide(output_dir: Path) -> str:
 
 ---
 
-## 🚨 Alertes Power BI - Types
+"""
+
+_ALERTS_GUIDE_TYPE1 = """## 🚨 Alertes Power BI - Types
 
 ### Type 1 : Visual Alert (Native)
 
@@ -96,7 +112,9 @@ Repeat: true
 
 ---
 
-### Type 2 : Power Automate Alert Rule
+"""
+
+_ALERTS_GUIDE_TYPE2 = """### Type 2 : Power Automate Alert Rule
 
 **Pour :** Logique complexe, multi-conditions
 
@@ -222,7 +240,9 @@ Repeat: true
 
 ---
 
-### Type 3 : Hybrid - Visual + Flow
+"""
+
+_ALERTS_GUIDE_TYPE3 = """### Type 3 : Hybrid - Visual + Flow
 
 **Pour :** Best of both worlds
 
@@ -325,7 +345,9 @@ Power Automate Flow
 
 ---
 
-## 🔔 Alert Patterns Courants
+"""
+
+_ALERTS_GUIDE_PATTERNS = """## 🔔 Alert Patterns Courants
 
 ### Pattern 1 : Threshold Alert (Statique)
 
@@ -461,7 +483,9 @@ END IF;
 
 ---
 
-## 📧 Notification Channels
+"""
+
+_ALERTS_GUIDE_CHANNELS = """## 📧 Notification Channels
 
 ### Channel 1 : Email
 
@@ -566,7 +590,9 @@ END IF;
 
 ---
 
-## 📊 Alert Management
+"""
+
+_ALERTS_GUIDE_FOOTER = """## 📊 Alert Management
 
 ### Dashboard Alerts
 
@@ -727,128 +753,172 @@ END IF;
 
 **✨ Guide généré automatiquement par migrate_data_alerts.py**
 """
-    
-    with open(guide_path, 'w', encoding='utf-8') as f:
-        f.write(guide_content)
+
+_ALERTS_GUIDE_FRAGMENTS = (
+    _ALERTS_GUIDE_HEADER,
+    _ALERTS_GUIDE_TYPE1,
+    _ALERTS_GUIDE_TYPE2,
+    _ALERTS_GUIDE_TYPE3,
+    _ALERTS_GUIDE_PATTERNS,
+    _ALERTS_GUIDE_CHANNELS,
+    _ALERTS_GUIDE_FOOTER,
+)
+_ALERTS_GUIDE_BYTES = b''.join(fragment.encode('utf-8') for fragment in _ALERTS_GUIDE_FRAGMENTS)
+
+
+def generate_alerts_migration_guide(output_dir: Path) -> str:
+    """Génère un guide complet de migration des alertes."""
+    guide_path = output_dir / "ALERTS_MIGRATION_GUIDE.md"
+    write_if_changed(guide_path, _ALERTS_GUIDE_BYTES)
     
     return str(guide_path)
 
 
-def generate_alert_templates(output_dir: Path) -> str:
-    """Génère des templates d'alertes."""
-    template_path = output_dir / "alert_templates.json"
-    
-    templates = {
-        "visual_alerts": [
-            {
-                "name": "Revenue Threshold Alert",
-                "metric_type": "Card",
-                "condition": "exceeds",
-                "threshold": 500000,
-                "frequency": "hourly",
-                "notifications": {
-                    "type": "email",
-                    "recipients": ["manager@company.com"],
-                    "repeat": True
-                }
-            },
-            {
-                "name": "Sales Target Alert",
-                "metric_type": "Gauge",
-                "condition": "below",
-                "threshold": 0.8,
-                "frequency": "daily",
-                "notifications": {
-                    "type": "email",
-                    "recipients": ["sales.team@company.com"],
-                    "repeat": False
-                }
+_ALERT_TEMPLATES = {
+    "visual_alerts": [
+        {
+            "name": "Revenue Threshold Alert",
+            "metric_type": "Card",
+            "condition": "exceeds",
+            "threshold": 500000,
+            "frequency": "hourly",
+            "notifications": {
+                "type": "email",
+                "recipients": ["manager@company.com"],
+                "repeat": True
             }
-        ],
-        "flow_alerts": [
-            {
-                "name": "Anomaly Detection Flow",
-                "trigger": "recurrence",
-                "frequency": "daily",
-                "actions": [
-                    "query_dataset",
-                    "detect_anomalies",
-                    "send_alert_if_detected"
-                ]
-            },
-            {
-                "name": "Multi-Condition Alert",
-                "trigger": "recurrence",
-                "conditions": [
-                    {"metric": "Sales", "operator": "below", "value": 100000},
-                    {"metric": "Margin", "operator": "below", "value": 0.2}
-                ],
-                "actions": [
-                    "send_email",
-                    "post_teams",
-                    "log_event"
-                ]
+        },
+        {
+            "name": "Sales Target Alert",
+            "metric_type": "Gauge",
+            "condition": "below",
+            "threshold": 0.8,
+            "frequency": "daily",
+            "notifications": {
+                "type": "email",
+                "recipients": ["sales.team@company.com"],
+                "repeat": False
             }
-        ]
+        }
+    ],
+    "flow_alerts": [
+        {
+            "name": "Anomaly Detection Flow",
+            "trigger": "recurrence",
+            "frequency": "daily",
+            "actions": [
+                "query_dataset",
+                "detect_anomalies",
+                "send_alert_if_detected"
+            ]
+        },
+        {
+            "name": "Multi-Condition Alert",
+            "trigger": "recurrence",
+            "conditions": [
+                {"metric": "Sales", "operator": "below", "value": 100000},
+                {"metric": "Margin", "operator": "below", "value": 0.2}
+            ],
+            "actions": [
+                "send_email",
+                "post_teams",
+                "log_event"
+            ]
+        }
+    ]
+}
+_ALERT_TEMPLATES_BYTES = _json_bytes(_ALERT_TEMPLATES)
+
+
+_ALERT_INVENTORY = {
+    "alerts": [
+        {
+            "alert_id": "alert_001",
+            "name": "High Revenue Alert",
+            "metric": "Total Sales Revenue",
+            "type": "threshold",
+            "condition": "exceeds",
+            "threshold": 500000,
+            "frequency": "hourly",
+            "recipients": ["manager@company.com"],
+            "power_bi_equivalent": "Visual Alert",
+            "migration_status": "planned",
+            "effort_hours": 0.5,
+            "complexity": "simple"
+        },
+        {
+            "alert_id": "alert_002",
+            "name": "Sales Target Miss",
+            "metric": "Sales vs Target",
+            "type": "threshold",
+            "condition": "below",
+            "threshold": 0.95,
+            "frequency": "weekly",
+            "recipients": ["sales.team@company.com"],
+            "power_bi_equivalent": "Power Automate Flow",
+            "migration_status": "planned",
+            "effort_hours": 2,
+            "complexity": "medium"
+        }
+    ],
+    "summary": {
+        "total_alerts": 2,
+        "visual_alerts": 1,
+        "flow_alerts": 1,
+        "migrated": 0,
+        "total_effort_hours": 2.5
     }
-    
-    with open(template_path, 'w', encoding='utf-8') as f:
-        json.dump(templates, f, indent=2, ensure_ascii=False)
+}
+_ALERT_INVENTORY_BYTES = _json_bytes(_ALERT_INVENTORY)
+
+_STATIC_JSON = {"templates": _ALERT_TEMPLATES, "inventory": _ALERT_INVENTORY}
+
+
+@lru_cache(maxsize=None)
+def _compact_json_bytes(name: str) -> bytes:
+    """Variante compacte d'un JSON statique, encodée au premier usage puis réutilisée"""
+    return _json_bytes(_STATIC_JSON[name], compact=True)
+
+
+def generate_alert_templates(output_dir: Path, compact: bool = False) -> str:
+    """Génère des templates d'alertes."""
+    template_path = output_dir / "alert_templates.json"
+    data = _compact_json_bytes("templates") if compact else _ALERT_TEMPLATES_BYTES
+    write_if_changed(template_path, data)
     
     return str(template_path)
 
 
-def generate_alert_inventory(output_dir: Path) -> str:
+def generate_alert_inventory(output_dir: Path, compact: bool = False) -> str:
     """Génère un template d'inventaire alertes."""
     inventory_path = output_dir / "alerts_inventory_template.json"
+    data = _compact_json_bytes("inventory") if compact else _ALERT_INVENTORY_BYTES
+    write_if_changed(inventory_path, data)
     
-    inventory = {
-        "alerts": [
-            {
-                "alert_id": "alert_001",
-                "name": "High Revenue Alert",
-                "metric": "Total Sales Revenue",
-                "type": "threshold",
-                "condition": "exceeds",
-                "threshold": 500000,
-                "frequency": "hourly",
-                "recipients": ["manager@company.com"],
-                "power_bi_equivalent": "Visual Alert",
-                "migration_status": "planned",
-                "effort_hours": 0.5,
-                "complexity": "simple"
-            },
-            {
-                "alert_id": "alert_002",
-                "name": "Sales Target Miss",
-                "metric": "Sales vs Target",
-                "type": "threshold",
-                "condition": "below",
-                "threshold": 0.95,
-                "frequency": "weekly",
-                "recipients": ["sales.team@company.com"],
-                "power_bi_equivalent": "Power Automate Flow",
-                "migration_status": "planned",
-                "effort_hours": 2,
-                "complexity": "medium"
-            }
-        ],
-        "summary": {
-            "total_alerts": 2,
-            "visual_alerts": 1,
-            "flow_alerts": 1,
-            "migrated": 0,
-            "total_effort_hours": 2.5
-        }
-    }
+    return str(inventory_path)
+
+
+def generate_all(output_dir: Path, compact: bool = False) -> Tuple[str, str, str]:
+    """Génère guide, templates et inventaire ; retourne leurs chemins.
     
-    with open(inventory_path, 'w', encoding='utf-8') as f:
-        json.dump(inventory, f, indent=2, ensure_ascii=False)
+    compact : JSON sans indentation (sorties destinées à des outils).
+    """
+    from concurrent.futures import ThreadPoolExecutor
     
-    return str(inventory_path)
+    ensure_output_dir(output_dir)
+    # Les trois artefacts sont indépendants : écritures menées en parallèle
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [
+            pool.submit(generate_alerts_migration_guide, output_dir),
+            pool.submit(generate_alert_templates, output_dir, compact),
+            pool.submit(generate_alert_inventory, output_dir, compact),
+        ]
+        return tuple(f.result() for f in futures)
 
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Migrer Data Alerts Qlik vers Power BI"
     )
@@ -857,21 +927,22 @@ def main():
         default="output/data_alerts",
         help="Répertoire de sortie"
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="JSON sans indentation (plus petit, pour consommation machine)"
+    )
     
     args = parser.parse_args()
     
     output_dir = Path(args.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
     
     print("📢 Génération guides Data Alerts...")
     
-    guide_file = generate_alerts_migration_guide(output_dir)
-    print(f"✅ Guide: {guide_file}")
+    guide_file, template_file, inventory_file = generate_all(output_dir, compact=args.compact)
     
-    template_file = generate_alert_templates(output_dir)
+    print(f"✅ Guide: {guide_file}")
     print(f"✅ Alert templates: {template_file}")
-    
-    inventory_file = generate_alert_inventory(output_dir)
     print(f"✅ Alerts inventory: {inventory_file}")
     
     print(f"\n📊 Fichiers générés:")
@@ -1,8 +1,10 @@
 """Migration - GeoAnalytics vers Azure Maps & Power BI Maps"""
-import json; from pathlib import Path
-def gen_geo_guide(output_dir: Path) -> str:
-    path = output_dir / "GEOANALYTICS_MIGRATION_GUIDE.md"
-    content = """# 🗺️ Guide Migration - GeoAnalytics vers Azure Maps
+from pathlib import Path
+
+from _common import ensure_output_dir, write_if_changed
+
+
+_GEO_GUIDE_TEXT = """# 🗺️ Guide Migration - GeoAnalytics vers Azure Maps
 
 **Date :** 13 février 2026
 
@@ -68,14 +70,18 @@ leaflet(data) %>%
 
 **Effort :** 1-2 semaines | **Complexité :** Moyenne
 """
-    with open(path, 'w') as f: f.write(content)
+_GEO_GUIDE_BYTES = _GEO_GUIDE_TEXT.encode('utf-8')
+
+
+def gen_geo_guide(output_dir: Path) -> str:
+    path = output_dir / "GEOANALYTICS_MIGRATION_GUIDE.md"
+    write_if_changed(path, _GEO_GUIDE_BYTES)
     return str(path)
 
 def main():
-    output_dir = Path("output/geoanalytics")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = ensure_output_dir("output/geoanalytics")
     print(f"✅ GeoAnalytics: {gen_geo_guide(output_dir)}")
     return 0
 
 if __name__ == "__main__":
-    import sys; sys.exit(main())
+    raise SystemExit(main())
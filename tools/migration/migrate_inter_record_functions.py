@@ -1,8 +1,10 @@
 """Migration - Inter-Record Functions (Peek, Previous, RowNo) vers DAX"""
-import json; from pathlib import Path
-def gen_guide(output_dir: Path) -> str:
-    path = output_dir / "INTER_RECORD_FUNCTIONS_MIGRATION_GUIDE.md"
-    content = """# 📊 Guide Migration - Inter-Record Functions vers DAX
+from pathlib import Path
+
+from _common import ensure_output_dir, write_if_changed
+
+
+_INTER_RECORD_GUIDE_TEXT = """# 📊 Guide Migration - Inter-Record Functions vers DAX
 
 **Date :** 13 février 2026
 
@@ -69,14 +71,18 @@ CALCULATE(
 
 **Effort :** 1-2 semaines | **Complexité :** Élevée (DAX avancé)
 """
-    with open(path, 'w') as f: f.write(content)
+_INTER_RECORD_GUIDE_BYTES = _INTER_RECORD_GUIDE_TEXT.encode('utf-8')
+
+
+def gen_guide(output_dir: Path) -> str:
+    path = output_dir / "INTER_RECORD_FUNCTIONS_MIGRATION_GUIDE.md"
+    write_if_changed(path, _INTER_RECORD_GUIDE_BYTES)
     return str(path)
 
 def main():
-    output_dir = Path("output/inter_record_functions")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = ensure_output_dir("output/inter_record_functions")
     print(f"✅ Inter-Record Functions: {gen_guide(output_dir)}")
     return 0
 
 if __name__ == "__main__":
-    import sys; sys.exit(main())
+    raise SystemExit(main())
@@ -4,14 +4,20 @@
 Migration List Boxes Qlik vers Segments Power BI
 """
 
-import json
+import logging
 import zipfile
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Dict
 from dataclasses import dataclass
 
+from _common import dumps_indented, setup_console_logging
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class QlikListBox:
     """List Box QlikView"""
     field: str
@@ -21,7 +27,7 @@ class QlikListBox:
     search_enabled: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class PowerBISlicer:
     """Segment Power BI"""
     field: str
@@ -31,6 +37,11 @@ class PowerBISlicer:
     multi_select: bool = True
 
 
+# Clés JSON d'un segment et attributs PowerBISlicer correspondants
+_SLICER_CONFIG_KEYS = ('field', 'table', 'displayName', 'type', 'multiSelect')
+_slicer_config_values = attrgetter('field', 'table', 'display_name', 'slicer_type', 'multi_select')
+
+
 class ListBoxMigrator:
     """Migration List Box → Segment"""
     
@@ -71,37 +82,30 @@ class ListBoxMigrator:
         return slicer
     
     def _guess_table(self, field: str) -> str:
-        """Devine la table depuis le nom du champ"""
-        field_lower = field.lower()
-        
-        for keyword, table in self.FIELD_TO_TABLE.items():
-            if keyword in field_lower:
-                return table
+        """Devine la table depuis le nom du champ.
         
-        return "FactTable"
+        Seul le mapping par défaut passe par la version mémoïsée ; un
+        FIELD_TO_TABLE redéfini (sous-classe, instance) est parcouru à chaque appel.
+        """
+        if self.FIELD_TO_TABLE is ListBoxMigrator.FIELD_TO_TABLE:
+            return _guess_table(field)
+        return _match_table(field.lower(), self.FIELD_TO_TABLE)
     
     def generate_slicer_config(self, slicers: List[PowerBISlicer]) -> str:
         """Génère configuration JSON pour segments"""
         
         config = {
-            "slicers": [
-                {
-                    "field": s.field,
-                    "table": s.table,
-                    "displayName": s.display_name,
-                    "type": s.slicer_type,
-                    "multiSelect": s.multi_select
-                }
-                for s in slicers
-            ]
+            "slicers": [dict(zip(_SLICER_CONFIG_KEYS, _slicer_config_values(s))) for s in slicers]
         }
         
+        # Sérialisé une seule fois : le texte écrit est aussi la valeur de retour
+        config_json = dumps_indented(config)
+        
         output_file = self.output_dir / "slicer_config.json"
-        with output_file.open('w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        output_file.write_text(config_json, encoding='utf-8')
         
-        print(f"✅ Configuration : {output_file}")
-        return json.dumps(config, indent=2)
+        logger.info("✅ Configuration : %s", output_file)
+        return config_json
     
     def generate_guide(self) -> str:
         """Génère guide de création segments"""
@@ -157,10 +161,25 @@ Pour synchroniser plusieurs segments :
 """
         
         guide_file.write_text(guide, encoding='utf-8')
-        print(f"✅ Guide : {guide_file}")
+        logger.info("✅ Guide : %s", guide_file)
         return guide
 
 
+def _match_table(field_lower: str, field_to_table: Dict[str, str]) -> str:
+    """Table du premier mot-clé de field_to_table contenu dans le nom (en minuscules)"""
+    for keyword, table in field_to_table.items():
+        if keyword in field_lower:
+            return table
+    
+    return "FactTable"
+
+
+@lru_cache(maxsize=1024)
+def _guess_table(field: str) -> str:
+    """Devine la table depuis le nom du champ avec le mapping par défaut (mémoïsé par nom de champ)"""
+    return _match_table(field.lower(), ListBoxMigrator.FIELD_TO_TABLE)
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Migration List Boxes")
@@ -168,6 +187,8 @@ def main():
     parser.add_argument('--output-dir', type=Path, default=Path('output/listboxes'))
     args = parser.parse_args()
     
+    setup_console_logging()
+    
     migrator = ListBoxMigrator(output_dir=args.output_dir)
     
     if args.example:
@@ -182,10 +203,10 @@ def main():
         migrator.generate_slicer_config(slicers)
         migrator.generate_guide()
         
-        print(f"\n✅ Exemple généré avec {len(slicers)} segments")
-        print(f"📁 Fichiers dans : {args.output_dir}")
+        logger.info("\n✅ Exemple généré avec %d segments", len(slicers))
+        logger.info("📁 Fichiers dans : %s", args.output_dir)
     else:
-        print("Utilisez --example pour générer un exemple")
+        logger.info("Utilisez --example pour générer un exemple")
     
     return 0
 
@@ -5,14 +5,92 @@ Migration Master Items Qlik vers Power BI
 Extrait dimensions et mesures maîtres pour les recréer dans Power BI
 """
 
-import json
+import hashlib
+import io
+import itertools
+import logging
+import os
+import pickle
+import re
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass, field
 
+from _common import (
+    EMPTY,
+    call_captured,
+    dumps_indented,
+    intern_str,
+    json_array_end,
+    json_array_item,
+    loads,
+    setup_console_logging,
+    write_json,
+)
 
-@dataclass
+try:
+    import ijson  # Parseur JSON incrémental (optionnel)
+except ImportError:
+    ijson = None
+
+# Taille des tampons d'E/S (lecture du membre app.json, écriture des sorties)
+_READ_BUFFER_SIZE = 1 << 20
+_WRITE_BUFFER_SIZE = 1 << 20
+
+logger = logging.getLogger(__name__)
+
+# Cache disque (optionnel, --cache) des master items extraits, par QVF
+# (chemin, date de modification, taille) et par version du code d'extraction
+_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'qlik2pbi'
+
+# Préfixes ijson des entrées de qDimensionList / qMeasureList → indice dans _master_item_lists
+_MASTER_ITEM_PREFIXES = {'properties.qDimensionList.item': 0, 'properties.qMeasureList.item': 1}
+
+_DAX_HEADER = "// Mesures DAX depuis Master Items Qlik\n\n"
+_PQ_HEADER = "// Dimensions depuis Master Items\n\n"
+_MEASURE_SEPARATOR = "-" * 60 + "\n\n"
+
+# Agrégations Qlik → DAX, converties en une seule passe
+_QLIK_AGG_RE = re.compile(r'\b(sum|avg|count|min|max)\s*\(', re.IGNORECASE)
+_QLIK_AGG_TO_DAX = {'sum': 'SUM(', 'avg': 'AVERAGE(', 'count': 'COUNT(', 'min': 'MIN(', 'max': 'MAX('}
+
+
+def _write_parts(path: Path, parts: List[str]) -> str:
+    """Écrit les fragments via un tampon de 1 MiB ; retourne le texte complet"""
+    with path.open('w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.writelines(parts)
+    return ''.join(parts)
+
+
+def _open_app_json(qvf: zipfile.ZipFile) -> io.BufferedReader:
+    """Ouvre app.json en lecture tamponnée (CRC-32 contrôlé par zipfile)"""
+    member = qvf.open('app.json')
+    return io.BufferedReader(member, buffer_size=_READ_BUFFER_SIZE)
+
+
+def _dax_aggregation(match: re.Match) -> str:
+    """Remplacement DAX d'une agrégation Qlik reconnue par _QLIK_AGG_RE"""
+    return _QLIK_AGG_TO_DAX[match.group(1).lower()]
+
+
+@lru_cache(maxsize=1024)
+def _convert_expression_to_dax(qlik_expr: str) -> str:
+    """Conversion basique expression Qlik → DAX (mémoïsée : les mesures partagent souvent leurs expressions)"""
+    # Simple mapping
+    expr = _QLIK_AGG_RE.sub(_dax_aggregation, qlik_expr) if '(' in qlik_expr else qlik_expr
+    
+    # Ajouter commentaire si Set Analysis détecté
+    if '{' in expr and '}' in expr:
+        return f"// TODO: Convertir Set Analysis\n    // Original: {qlik_expr}\n    // Utiliser migrate_set_analysis.py"
+    
+    return expr
+
+
+@dataclass(slots=True)
 class MasterDimension:
     """Dimension maître Qlik"""
     id: str
@@ -23,7 +101,7 @@ class MasterDimension:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class MasterMeasure:
     """Mesure maître Qlik"""
     id: str
@@ -32,171 +110,20 @@ class MasterMeasure:
     description: str = ""
     format: str = ""
     number_format: Optional[Dict] = None
+    has_set_analysis: bool = field(init=False, default=False)
+    
+    def __post_init__(self):
+        # Détection Set Analysis calculée une fois, à la construction
+        self.has_set_analysis = '{' in self.expression and '}' in self.expression
 
 
-class MasterItemsMigrator:
-    """Migration Master Items Qlik → Power BI"""
-    
-    def __init__(self, output_dir: Path = None):
-        self.output_dir = output_dir or Path('output/master_items')
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.dimensions: List[MasterDimension] = []
-        self.measures: List[MasterMeasure] = []
-    
-    def extract_master_items(self, qvf_path: Path) -> tuple:
-        """Extrait les master items d'un QVF"""
-        print(f"📐 Extraction Master Items depuis : {qvf_path}")
-        
-        try:
-            with zipfile.ZipFile(qvf_path, 'r') as qvf:
-                if 'app.json' in qvf.namelist():
-                    app_data = json.loads(qvf.read('app.json').decode('utf-8'))
-                    
-                    # Dimensions maîtres
-                    if 'properties' in app_data:
-                        # Dimensions
-                        dim_list = app_data['properties'].get('qDimensionList', [])
-                        for dim in dim_list:
-                            dimension = MasterDimension(
-                                id=dim.get('qInfo', {}).get('qId', ''),
-                                name=dim.get('qMetaDef', {}).get('title', ''),
-                                field=dim.get('qDim', {}).get('qFieldDefs', [''])[0],
-                                label_expression=dim.get('qDim', {}).get('qLabelExpression'),
-                                grouping=dim.get('qDim', {}).get('qFieldDefs', []),
-                                description=dim.get('qMetaDef', {}).get('description', '')
-                            )
-                            self.dimensions.append(dimension)
-                        
-                        # Mesures
-                        measure_list = app_data['properties'].get('qMeasureList', [])
-                        for meas in measure_list:
-                            measure = MasterMeasure(
-                                id=meas.get('qInfo', {}).get('qId', ''),
-                                name=meas.get('qMetaDef', {}).get('title', ''),
-                                expression=meas.get('qMeasure', {}).get('qDef', ''),
-                                description=meas.get('qMetaDef', {}).get('description', ''),
-                                format=meas.get('qMeasure', {}).get('qNumFormat', {}).get('qFmt', ''),
-                                number_format=meas.get('qMeasure', {}).get('qNumFormat')
-                            )
-                            self.measures.append(measure)
-            
-            print(f"✅ {len(self.dimensions)} dimensions + {len(self.measures)} mesures trouvées")
-        except Exception as e:
-            print(f"❌ Erreur : {e}")
-        
-        return self.dimensions, self.measures
-    
-    def generate_dax_measures(self, output_file: Path = None) -> str:
-        """Génère les mesures DAX"""
-        output_file = output_file or self.output_dir / "master_measures.dax"
-        
-        dax = "// Mesures DAX depuis Master Items Qlik\n\n"
-        
-        for measure in self.measures:
-            dax += f"// {measure.description}\n" if measure.description else ""
-            dax += f"{measure.name} = \n"
-            
-            # Convertir expression Qlik en DAX basique
-            dax_expr = self._convert_expression_to_dax(measure.expression)
-            dax += f"    {dax_expr}\n\n"
-            
-            if measure.number_format:
-                dax += f"// Format: {measure.format}\n"
-            
-            dax += "-" * 60 + "\n\n"
-        
-        output_file.write_text(dax, encoding='utf-8')
-        print(f"✅ Mesures DAX : {output_file}")
-        return dax
-    
-    def _convert_expression_to_dax(self, qlik_expr: str) -> str:
-        """Conversion basique expression Qlik → DAX"""
-        # Simple mapping
-        expr = qlik_expr
-        expr = expr.replace('Sum(', 'SUM(').replace('sum(', 'SUM(')
-        expr = expr.replace('Avg(', 'AVERAGE(').replace('avg(', 'AVERAGE(')
-        expr = expr.replace('Count(', 'COUNT(').replace('count(', 'COUNT(')
-        expr = expr.replace('Min(', 'MIN(').replace('min(', 'MIN(')
-        expr = expr.replace('Max(', 'MAX(').replace('max(', 'MAX(')
-        
-        # Ajouter commentaire si Set Analysis détecté
-        if '{' in expr and '}' in expr:
-            return f"// TODO: Convertir Set Analysis\n    // Original: {qlik_expr}\n    // Utiliser migrate_set_analysis.py"
-        
-        return expr
-    
-    def generate_dimension_table(self, output_file: Path = None) -> str:
-        """Génère table M pour dimensions"""
-        output_file = output_file or self.output_dir / "master_dimensions.pq"
-        
-        m_code = "// Dimensions depuis Master Items\n\n"
-        
-        for dim in self.dimensions:
-            m_code += f"// Dimension: {dim.name}\n"
-            if dim.description:
-                m_code += f"// {dim.description}\n"
-            
-            if len(dim.grouping) > 1:
-                # Hiérarchie
-                m_code += f"// Hiérarchie: {', '.join(dim.grouping)}\n"
-            
-            m_code += f"// Champ: {dim.field}\n\n"
-        
-        output_file.write_text(m_code, encoding='utf-8')
-        print(f"✅ Dimensions : {output_file}")
-        return m_code
-    
-    def generate_config_json(self, output_file: Path = None) -> Dict:
-        """Génère configuration JSON complète"""
-        output_file = output_file or self.output_dir / "master_items_config.json"
-        
-        config = {
-            "master_dimensions": [
-                {
-                    "id": d.id,
-                    "name": d.name,
-                    "field": d.field,
-                    "grouping": d.grouping,
-                    "description": d.description,
-                    "is_hierarchy": len(d.grouping) > 1
-                }
-                for d in self.dimensions
-            ],
-            "master_measures": [
-                {
-                    "id": m.id,
-                    "name": m.name,
-                    "expression": m.expression,
-                    "description": m.description,
-                    "format": m.format,
-                    "has_set_analysis": '{' in m.expression and '}' in m.expression
-                }
-                for m in self.measures
-            ],
-            "statistics": {
-                "total_dimensions": len(self.dimensions),
-                "total_measures": len(self.measures),
-                "hierarchies": len([d for d in self.dimensions if len(d.grouping) > 1]),
-                "measures_with_set_analysis": len([m for m in self.measures if '{' in m.expression])
-            }
-        }
-        
-        with output_file.open('w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Configuration : {output_file}")
-        return config
-    
-    def generate_migration_guide(self, output_file: Path = None) -> str:
-        """Génère guide de migration"""
-        output_file = output_file or self.output_dir / "MASTER_ITEMS_GUIDE.md"
-        
-        guide = f"""# Migration Master Items Qlik → Power BI
+# Sections du guide de migration (gabarits remplis par format_map)
+_GUIDE_HEADER = """# Migration Master Items Qlik → Power BI
 
 ## Résumé
 
-**Master Dimensions trouvées :** {len(self.dimensions)}  
-**Master Measures trouvées :** {len(self.measures)}
+**Master Dimensions trouvées :** {dimension_count}  
+**Master Measures trouvées :** {measure_count}
 
 ---
 
@@ -215,37 +142,15 @@ Pour chaque dimension :
 3. Utiliser la formule DAX :
 
 """
-        
-        for dim in self.dimensions:
-            if len(dim.grouping) == 1:
-                guide += f"""
-**{dim.name}**
+
+_GUIDE_DIMENSION_BLOCK = """
+**{name}**
 ```dax
-{dim.name} = [{dim.field}]
+{name} = [{field}]
 ```
 """
-        
-        guide += """
-#### Hiérarchies
 
-Pour les dimensions groupées :
-
-1. **Données** → Clic droit sur la colonne de niveau supérieur
-2. **Créer une hiérarchie**
-3. Glisser-déposer les autres niveaux
-
-"""
-        
-        hierarchies = [d for d in self.dimensions if len(d.grouping) > 1]
-        if hierarchies:
-            guide += "**Hiérarchies détectées :**\n\n"
-            for hier in hierarchies:
-                guide += f"**{hier.name}**\n"
-                for i, level in enumerate(hier.grouping, 1):
-                    guide += f"  {i}. {level}\n"
-                guide += "\n"
-        
-        guide += f"""
+_GUIDE_MEASURES_HEADER = """
 ---
 
 ## Master Measures → Mesures DAX
@@ -258,27 +163,39 @@ Les mesures maîtres Qlik deviennent des mesures DAX dans Power BI.
 2. **Modélisation** → **Nouvelle mesure**
 3. Copier le code DAX depuis `master_measures.dax`
 
-### Mesures Converties ({len(self.measures)})
+### Mesures Converties ({measure_count})
 
 """
-        
-        for measure in self.measures:
-            guide += f"""
-#### {measure.name}
 
-**Description :** {measure.description or 'N/A'}  
-**Format :** {measure.format or 'Auto'}
+_GUIDE_MEASURE_BLOCK = """
+#### {name}
+
+**Description :** {description}  
+**Format :** {format}
 
 **Expression Qlik :**
 ```qlik
-{measure.expression}
+{expression}
 ```
 
 """
-            if '{' in measure.expression and '}' in measure.expression:
-                guide += "⚠️ **Contient Set Analysis** - Utiliser `migrate_set_analysis.py`\n\n"
-        
-        guide += """
+
+_GUIDE_SET_ANALYSIS_NOTE = "⚠️ **Contient Set Analysis** - Utiliser `migrate_set_analysis.py`\n\n"
+
+_GUIDE_HIERARCHIES_INTRO = """
+#### Hiérarchies
+
+Pour les dimensions groupées :
+
+1. **Données** → Clic droit sur la colonne de niveau supérieur
+2. **Créer une hiérarchie**
+3. Glisser-déposer les autres niveaux
+
+"""
+
+_GUIDE_HIERARCHIES_FOUND = "**Hiérarchies détectées :**\n\n"
+
+_GUIDE_FOOTER = """
 ---
 
 ## Utilisation
@@ -322,48 +239,495 @@ Glisser-déposer dans les visuels comme d'habitude.
 
 **✨ Fichiers dans :** `{self.output_dir}`
 """
+
+
+def _measure_dax(measure: MasterMeasure) -> str:
+    """Bloc DAX d'une mesure"""
+    parts = []
+    if measure.description:
+        parts.append(f"// {measure.description}\n")
+    
+    # Convertir expression Qlik en DAX basique
+    parts.append(f"{measure.name} = \n    {_convert_expression_to_dax(measure.expression)}\n\n")
+    
+    if measure.number_format:
+        parts.append(f"// Format: {measure.format}\n")
+    
+    parts.append(_MEASURE_SEPARATOR)
+    return ''.join(parts)
+
+
+# Clés des entrées de configuration JSON, lues d'un bloc sur les dataclasses
+_MEASURE_CONFIG_KEYS = ('id', 'name', 'expression', 'description', 'format', 'has_set_analysis')
+_measure_config_values = attrgetter(*_MEASURE_CONFIG_KEYS)
+_DIMENSION_CONFIG_KEYS = ('id', 'name', 'field', 'grouping', 'description')
+_dimension_config_values = attrgetter(*_DIMENSION_CONFIG_KEYS)
+
+
+def _measure_config(measure: MasterMeasure) -> Dict:
+    """Entrée de configuration JSON d'une mesure"""
+    return dict(zip(_MEASURE_CONFIG_KEYS, _measure_config_values(measure)))
+
+
+def _measure_guide(measure: MasterMeasure) -> str:
+    """Section du guide pour une mesure"""
+    guide = _GUIDE_MEASURE_BLOCK.format_map({
+        'name': measure.name,
+        'description': measure.description or 'N/A',
+        'format': measure.format or 'Auto',
+        'expression': measure.expression
+    })
+    if measure.has_set_analysis:
+        guide += _GUIDE_SET_ANALYSIS_NOTE
+    return guide
+
+
+def _dimension_pq(dim: MasterDimension) -> str:
+    """Bloc M (commentaires) d'une dimension"""
+    parts = [f"// Dimension: {dim.name}\n"]
+    if dim.description:
+        parts.append(f"// {dim.description}\n")
+    
+    if len(dim.grouping) > 1:
+        # Hiérarchie
+        parts.append(f"// Hiérarchie: {', '.join(dim.grouping)}\n")
+    
+    parts.append(f"// Champ: {dim.field}\n\n")
+    return ''.join(parts)
+
+
+def _dimension_config(dim: MasterDimension) -> Dict:
+    """Entrée de configuration JSON d'une dimension"""
+    config = dict(zip(_DIMENSION_CONFIG_KEYS, _dimension_config_values(dim)))
+    config["is_hierarchy"] = len(dim.grouping) > 1
+    return config
+
+
+def _dimension_guide(dim: MasterDimension) -> str:
+    """Section du guide pour une dimension simple"""
+    return _GUIDE_DIMENSION_BLOCK.format_map({'name': dim.name, 'field': dim.field})
+
+
+def _hierarchy_guide(hier: MasterDimension) -> str:
+    """Section du guide pour une hiérarchie détectée"""
+    levels = ''.join(f"  {i}. {level}\n" for i, level in enumerate(hier.grouping, 1))
+    return f"**{hier.name}**\n{levels}\n"
+
+
+# Enregistrements du cache : arguments positionnels des constructeurs (indépendants
+# du module, qui peut être chargé sous __main__ ou sous son nom)
+_dimension_values = attrgetter('id', 'name', 'field', 'label_expression', 'grouping', 'description')
+_measure_values = attrgetter('id', 'name', 'expression', 'description', 'format', 'number_format')
+
+
+@lru_cache(maxsize=1)
+def _code_fingerprint() -> str:
+    """Empreinte de ce module : toute modification du code d'extraction invalide le cache"""
+    return hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
+
+
+def _cache_file(cache_dir: Path, qvf_path: Path) -> Path:
+    """Fichier de cache d'un QVF, invalidé par toute modification du fichier ou du code"""
+    stat = qvf_path.stat()
+    key = f"{_code_fingerprint()}:{qvf_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    return cache_dir / f"{hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()}.pkl"
+
+
+def _iter_cached(cache_file: Path) -> Iterator[Union[MasterDimension, MasterMeasure]]:
+    """Relit les items d'un cache, un enregistrement pickle à la fois"""
+    with cache_file.open('rb', buffering=_READ_BUFFER_SIZE) as f:
+        while True:
+            try:
+                is_measure, values = pickle.load(f)
+            except EOFError:
+                return
+            yield MasterMeasure(*values) if is_measure else MasterDimension(*values)
+
+
+def _write_through_cache(items: Iterable[Union[MasterDimension, MasterMeasure]],
+                         cache_file: Path) -> Iterator[Union[MasterDimension, MasterMeasure]]:
+    """Produit les items en les enregistrant au passage ; le cache n'est publié qu'une fois le flux épuisé"""
+    tmp_file = cache_file.with_name(f"{cache_file.stem}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        f = tmp_file.open('wb', buffering=_WRITE_BUFFER_SIZE)
+    except OSError:
+        # Cache inaccessible (répertoire en lecture seule...) : lecture directe
+        yield from items
+        return
+    
+    try:
+        with f:
+            for item in items:
+                if isinstance(item, MasterMeasure):
+                    pickle.dump((True, _measure_values(item)), f, pickle.HIGHEST_PROTOCOL)
+                else:
+                    pickle.dump((False, _dimension_values(item)), f, pickle.HIGHEST_PROTOCOL)
+                yield item
+        os.replace(tmp_file, cache_file)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+
+class MasterItemsMigrator:
+    """Migration Master Items Qlik → Power BI"""
+    
+    def __init__(self, output_dir: Path = None, cache_dir: Optional[Path] = None):
+        self.output_dir = output_dir or Path('output/master_items')
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir = cache_dir  # None : pas de cache disque
+        self.dimensions: List[MasterDimension] = []
+        self.measures: List[MasterMeasure] = []
+    
+    def extract_master_items(self, qvf_path: Path) -> tuple:
+        """Extrait les master items d'un QVF.
+        
+        Les items ne sont ajoutés qu'une fois la lecture terminée : un app.json
+        illisible (tronqué...) n'en laisse aucun de partiel.
+        """
+        dimensions, measures = [], []
+        try:
+            for item in self.iter_master_items(qvf_path):
+                if isinstance(item, MasterMeasure):
+                    measures.append(item)
+                else:
+                    dimensions.append(item)
+        except Exception as e:
+            logger.error("❌ Erreur : %s", e)
+        else:
+            self.dimensions.extend(dimensions)
+            self.measures.extend(measures)
+            logger.info("✅ %d dimensions + %d mesures trouvées", len(self.dimensions), len(self.measures))
+        
+        return self.dimensions, self.measures
+    
+    def iter_master_items(self, qvf_path: Path) -> Iterator[Union[MasterDimension, MasterMeasure]]:
+        """Produit au fil de l'eau les dimensions maîtres d'un QVF, puis ses mesures.
+        
+        Avec un cache disque (cache_dir), un QVF inchangé depuis une exécution
+        précédente est relu depuis le cache (sans décompression ni parsing
+        JSON) ; sinon l'archive reste ouverte tant que le générateur n'est pas
+        épuisé ou fermé, et le cache éventuel est écrit au passage.
+        """
+        logger.info("📐 Extraction Master Items depuis : %s", qvf_path)
+        
+        if self.cache_dir is None:
+            yield from self._iter_qvf(qvf_path)
+            return
+        
+        cache_file = _cache_file(self.cache_dir, qvf_path)
+        if cache_file.exists():
+            logger.info("♻️ Cache : %s", cache_file)
+            yield from _iter_cached(cache_file)
+        else:
+            yield from _write_through_cache(self._iter_qvf(qvf_path), cache_file)
+    
+    def _iter_qvf(self, qvf_path: Path) -> Iterator[Union[MasterDimension, MasterMeasure]]:
+        """Items lus directement dans l'archive QVF"""
+        with zipfile.ZipFile(qvf_path, 'r') as qvf:
+            if 'app.json' in qvf.namelist():
+                dim_list, measure_list = self._master_item_lists(qvf)
+                yield from self._iter_dims(dim_list)
+                yield from self._iter_measures(measure_list)
+    
+    @staticmethod
+    def _iter_dims(dim_list: Iterable[Dict]) -> Iterator[MasterDimension]:
+        """Dimensions maîtres depuis les entrées qDimensionList"""
+        for dim in dim_list:
+            meta = dim.get('qMetaDef') or EMPTY
+            q_dim = dim.get('qDim') or EMPTY
+            field_defs = q_dim.get('qFieldDefs') or []
+            yield MasterDimension(
+                id=(dim.get('qInfo') or EMPTY).get('qId', ''),
+                name=intern_str(meta.get('title', '')),
+                field=intern_str(field_defs[0]) if field_defs else '',
+                label_expression=q_dim.get('qLabelExpression'),
+                grouping=field_defs,
+                description=intern_str(meta.get('description', ''))
+            )
+    
+    @staticmethod
+    def _iter_measures(measure_list: Iterable[Dict]) -> Iterator[MasterMeasure]:
+        """Mesures maîtres depuis les entrées qMeasureList"""
+        for meas in measure_list:
+            meta = meas.get('qMetaDef') or EMPTY
+            q_measure = meas.get('qMeasure') or EMPTY
+            num_format = q_measure.get('qNumFormat')
+            yield MasterMeasure(
+                id=(meas.get('qInfo') or EMPTY).get('qId', ''),
+                name=intern_str(meta.get('title', '')),
+                expression=q_measure.get('qDef', ''),
+                description=intern_str(meta.get('description', '')),
+                format=intern_str((num_format or EMPTY).get('qFmt', '')),
+                number_format=num_format
+            )
+    
+    def extract_many(self, qvf_paths: List[Path],
+                     max_workers: Optional[int] = None) -> Tuple[List[MasterDimension], List[MasterMeasure]]:
+        """Extrait les master items de plusieurs QVF en parallèle (un processus par fichier).
+        
+        Décompression et parsing JSON restent liés au GIL : les processus passent
+        à l'échelle avec le nombre de cœurs. Les résultats sont fusionnés dans
+        l'ordre de `qvf_paths`, messages de log compris.
+        """
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(call_captured, _extract_in_worker, self.output_dir, self.cache_dir, path)
+                       for path in qvf_paths]
+            for path, future in zip(qvf_paths, futures):
+                try:
+                    (dimensions, measures), output = future.result()
+                except Exception as e:
+                    logger.error("❌ Erreur (%s) : %s", path, e)
+                    continue
+                # Journalisation côté parent, dans l'ordre des fichiers
+                if output:
+                    logger.info("%s", output.rstrip('\n'))
+                self.dimensions.extend(dimensions)
+                self.measures.extend(measures)
+        
+        return self.dimensions, self.measures
+    
+    @staticmethod
+    def _master_item_lists(qvf: zipfile.ZipFile) -> Tuple[List[Dict], List[Dict]]:
+        """Retourne (qDimensionList, qMeasureList) de app.json, en une seule lecture du membre.
+        
+        Avec ijson, seules les entrées des deux listes sont construites, depuis
+        un unique flux d'événements ; sinon le document complet est chargé.
+        """
+        if ijson is not None:
+            lists = ([], [])
+            builder = item_prefix = None
+            with _open_app_json(qvf) as fp:
+                for prefix, event, value in ijson.parse(fp, use_float=True):
+                    if builder is not None:
+                        builder.event(event, value)
+                        if prefix == item_prefix and (event == 'end_map' or event == 'end_array'):
+                            lists[_MASTER_ITEM_PREFIXES[item_prefix]].append(builder.value)
+                            builder = None
+                    elif prefix in _MASTER_ITEM_PREFIXES:
+                        if event == 'start_map' or event == 'start_array':
+                            builder = ijson.ObjectBuilder()
+                            builder.event(event, value)
+                            item_prefix = prefix
+                        else:
+                            lists[_MASTER_ITEM_PREFIXES[prefix]].append(value)
+            return lists
+        
+        with _open_app_json(qvf) as fp:
+            app_data = loads(fp.read())
+        properties = app_data.get('properties', {})
+        return properties.get('qDimensionList', []), properties.get('qMeasureList', [])
+    
+    def generate_dax_measures(self, output_file: Path = None) -> str:
+        """Génère les mesures DAX"""
+        output_file = output_file or self.output_dir / "master_measures.dax"
+        
+        parts = [_DAX_HEADER]
+        parts.extend(_measure_dax(measure) for measure in self.measures)
+        
+        dax = _write_parts(output_file, parts)
+        logger.info("✅ Mesures DAX : %s", output_file)
+        return dax
+    
+    def _convert_expression_to_dax(self, qlik_expr: str) -> str:
+        """Conversion basique expression Qlik → DAX"""
+        return _convert_expression_to_dax(qlik_expr)
+    
+    def generate_dimension_table(self, output_file: Path = None) -> str:
+        """Génère table M pour dimensions"""
+        output_file = output_file or self.output_dir / "master_dimensions.pq"
+        
+        parts = [_PQ_HEADER]
+        parts.extend(_dimension_pq(dim) for dim in self.dimensions)
+        
+        m_code = _write_parts(output_file, parts)
+        logger.info("✅ Dimensions : %s", output_file)
+        return m_code
+    
+    @staticmethod
+    def _statistics(dimension_count: int, measure_count: int,
+                    hierarchies: int, measures_with_set_analysis: int) -> Dict:
+        """Bloc statistiques de la configuration"""
+        return {
+            "total_dimensions": dimension_count,
+            "total_measures": measure_count,
+            "hierarchies": hierarchies,
+            "measures_with_set_analysis": measures_with_set_analysis
+        }
+    
+    def generate_config_json(self, output_file: Path = None) -> Dict:
+        """Génère configuration JSON complète"""
+        output_file = output_file or self.output_dir / "master_items_config.json"
         
-        output_file.write_text(guide, encoding='utf-8')
-        print(f"✅ Guide : {output_file}")
+        config = {
+            "master_dimensions": [_dimension_config(d) for d in self.dimensions],
+            "master_measures": [_measure_config(m) for m in self.measures],
+            "statistics": self._statistics(
+                len(self.dimensions),
+                len(self.measures),
+                sum(len(d.grouping) > 1 for d in self.dimensions),
+                sum('{' in m.expression for m in self.measures)
+            )
+        }
+        
+        write_json(output_file, config)
+        
+        logger.info("✅ Configuration : %s", output_file)
+        return config
+    
+    def generate_migration_guide(self, output_file: Path = None) -> str:
+        """Génère guide de migration"""
+        output_file = output_file or self.output_dir / "MASTER_ITEMS_GUIDE.md"
+        
+        parts = [_GUIDE_HEADER.format(dimension_count=len(self.dimensions), measure_count=len(self.measures))]
+        parts.extend(_dimension_guide(d) for d in self.dimensions if len(d.grouping) == 1)
+        parts.append(_GUIDE_HIERARCHIES_INTRO)
+        
+        hierarchies = [_hierarchy_guide(d) for d in self.dimensions if len(d.grouping) > 1]
+        if hierarchies:
+            parts.append(_GUIDE_HIERARCHIES_FOUND)
+            parts.extend(hierarchies)
+        
+        parts.append(_GUIDE_MEASURES_HEADER.format(measure_count=len(self.measures)))
+        parts.extend(_measure_guide(m) for m in self.measures)
+        parts.append(_GUIDE_FOOTER)
+        
+        guide = _write_parts(output_file, parts)
+        logger.info("✅ Guide : %s", output_file)
         return guide
+    
+    def generate_all(self, items: Optional[Iterable[Union[MasterDimension, MasterMeasure]]] = None) -> Dict:
+        """Génère les quatre fichiers en une seule passe ; retourne les statistiques.
+        
+        `items` (par défaut les listes déjà extraites) est consommé au fil de
+        l'eau, dimensions d'abord puis mesures, comme le produit
+        iter_master_items : DAX, M et configuration sont écrits au passage.
+        Seules les sections du guide sont gardées jusqu'à la fin, son en-tête
+        dépendant des totaux.
+        """
+        if items is None:
+            items = itertools.chain(self.dimensions, self.measures)
+        
+        dax_file = self.output_dir / "master_measures.dax"
+        pq_file = self.output_dir / "master_dimensions.pq"
+        config_file = self.output_dir / "master_items_config.json"
+        guide_file = self.output_dir / "MASTER_ITEMS_GUIDE.md"
+        
+        dimension_guides = []
+        hierarchies = []
+        measure_guides = []
+        dimension_count = measure_count = measures_with_set_analysis = 0
+        
+        with (dax_file.open('w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as dax,
+              pq_file.open('w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as pq,
+              config_file.open('w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as config):
+            dax.write(_DAX_HEADER)
+            pq.write(_PQ_HEADER)
+            config.write('{\n  "master_dimensions": ')
+            
+            for item in items:
+                if isinstance(item, MasterMeasure):
+                    if not measure_count:
+                        # Première mesure : fin du tableau des dimensions
+                        config.write(json_array_end(dimension_count) + ',\n  "master_measures": ')
+                    measure_count += 1
+                    measures_with_set_analysis += '{' in item.expression
+                    
+                    dax.write(_measure_dax(item))
+                    config.write(json_array_item(_measure_config(item), measure_count == 1))
+                    measure_guides.append(_measure_guide(item))
+                else:
+                    dimension_count += 1
+                    pq.write(_dimension_pq(item))
+                    config.write(json_array_item(_dimension_config(item), dimension_count == 1))
+                    if len(item.grouping) > 1:
+                        # Les hiérarchies sont listées après les dimensions simples
+                        hierarchies.append(_hierarchy_guide(item))
+                    elif len(item.grouping) == 1:
+                        dimension_guides.append(_dimension_guide(item))
+            
+            if not measure_count:
+                config.write(json_array_end(dimension_count) + ',\n  "master_measures": ')
+            config.write(json_array_end(measure_count))
+            statistics = self._statistics(dimension_count, measure_count,
+                                          len(hierarchies), measures_with_set_analysis)
+            config.write(',\n  "statistics": ' + dumps_indented(statistics).replace('\n', '\n  ') + '\n}')
+        
+        parts = [_GUIDE_HEADER.format(dimension_count=dimension_count, measure_count=measure_count)]
+        parts.extend(dimension_guides)
+        parts.append(_GUIDE_HIERARCHIES_INTRO)
+        if hierarchies:
+            parts.append(_GUIDE_HIERARCHIES_FOUND)
+            parts.extend(hierarchies)
+        parts.append(_GUIDE_MEASURES_HEADER.format(measure_count=measure_count))
+        parts.extend(measure_guides)
+        parts.append(_GUIDE_FOOTER)
+        _write_parts(guide_file, parts)
+        
+        logger.info("✅ Mesures DAX : %s", dax_file)
+        logger.info("✅ Dimensions : %s", pq_file)
+        logger.info("✅ Configuration : %s", config_file)
+        logger.info("✅ Guide : %s", guide_file)
+        return statistics
+
+
+def _extract_in_worker(output_dir: Path, cache_dir: Optional[Path],
+                       qvf_path: Path) -> Tuple[List[MasterDimension], List[MasterMeasure]]:
+    """Extraction dans un processus de ProcessPoolExecutor (via call_captured)"""
+    migrator = MasterItemsMigrator(output_dir=output_dir, cache_dir=cache_dir)
+    return migrator.extract_master_items(qvf_path)
 
 
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Migration Master Items Qlik")
-    parser.add_argument('qvf_file', type=Path, help='Fichier QVF')
+    parser.add_argument('qvf_file', type=Path, nargs='?', help='Fichier QVF')
+    parser.add_argument('--batch', metavar='GLOB',
+                        help="Motif de fichiers QVF extraits en parallèle (master items fusionnés)")
     parser.add_argument('--output-dir', type=Path, default=Path('output/master_items'))
+    parser.add_argument('--cache', action='store_true',
+                        help=f"Lire et écrire le cache d'extraction ({_CACHE_DIR})")
     args = parser.parse_args()
+    if (args.qvf_file is None) == (args.batch is None):
+        parser.error("indiquer soit un fichier QVF, soit --batch")
+    
+    setup_console_logging()
     
-    if not args.qvf_file.exists():
-        print(f"❌ Fichier non trouvé : {args.qvf_file}")
+    if args.qvf_file is not None and not args.qvf_file.exists():
+        logger.error("❌ Fichier non trouvé : %s", args.qvf_file)
         return 1
     
-    print("📐 Migration Master Items Qlik → Power BI\n")
-    print("=" * 60)
+    logger.info("📐 Migration Master Items Qlik → Power BI\n")
+    logger.info("=" * 60)
     
-    migrator = MasterItemsMigrator(output_dir=args.output_dir)
+    migrator = MasterItemsMigrator(output_dir=args.output_dir,
+                                   cache_dir=_CACHE_DIR if args.cache else None)
     
-    # Extraction
-    dimensions, measures = migrator.extract_master_items(args.qvf_file)
+    # Extraction complète avant toute écriture : un QVF illisible ne laisse pas de fichiers tronqués
+    if args.batch is not None:
+        import glob
+        dimensions, measures = migrator.extract_many(sorted(Path(p) for p in glob.glob(args.batch)))
+    else:
+        dimensions, measures = migrator.extract_master_items(args.qvf_file)
     
     if not dimensions and not measures:
-        print("⚠️ Aucun master item trouvé")
+        logger.warning("⚠️ Aucun master item trouvé")
         return 0
     
-    # Génération
-    print("\n📝 Génération des fichiers...")
-    migrator.generate_dax_measures()
-    migrator.generate_dimension_table()
-    migrator.generate_config_json()
-    migrator.generate_migration_guide()
+    try:
+        # Génération
+        logger.info("\n📝 Génération des fichiers...")
+        statistics = migrator.generate_all()
+    except Exception as e:
+        logger.error("❌ Erreur : %s", e)
+        return 1
     
     # Résumé
-    print("\n" + "=" * 60)
-    print("✅ Migration terminée !")
-    print(f"📊 {len(dimensions)} dimensions + {len(measures)} mesures")
-    print(f"📁 Fichiers dans : {args.output_dir}")
+    logger.info("\n" + "=" * 60)
+    logger.info("✅ Migration terminée !")
+    logger.info("📊 %d dimensions + %d mesures", statistics['total_dimensions'], statistics['total_measures'])
+    logger.info("📁 Fichiers dans : %s", args.output_dir)
     
     return 0
 
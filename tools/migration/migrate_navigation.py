@@ -8,134 +8,63 @@ Author: Migration Team
 Date: 2026-02-13
 """
 
-import json
+import glob
+import io
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import argparse
 
+from _common import (
+    EMPTY,
+    call_captured,
+    dumps_indented,
+    ensure_output_dir,
+    intern_str,
+    json_array_end,
+    json_array_item,
+    loads,
+    write_json,
+)
 
-def extract_sheet_actions_from_qvf(qvf_path: str) -> Dict:
-    """
-    Extrait les sheet actions depuis un fichier QVF.
-    
-    Args:
-        qvf_path: Chemin vers le fichier QVF
-        
-    Returns:
-        Dictionnaire contenant les sheet actions trouvées
-    """
-    actions_data = {
-        "sheet_actions": [],
-        "navigation_patterns": [],
-        "metadata": {
-            "source_file": Path(qvf_path).name,
-            "total_actions": 0,
-            "total_sheets": 0
-        }
-    }
-    
-    try:
-        with zipfile.ZipFile(qvf_path, 'r') as qvf:
-            if 'app.json' in qvf.namelist():
-                app_data = json.loads(qvf.read('app.json').decode('utf-8'))
-                
-                # Extraire feuilles et leurs actions
-                if 'qSheetList' in app_data:
-                    for sheet in app_data['qSheetList']:
-                        sheet_id = sheet.get('qInfo', {}).get('qId')
-                        sheet_title = sheet.get('qMetaDef', {}).get('title', 'Untitled')
-                        
-                        sheet_actions = {
-                            "sheet_id": sheet_id,
-                            "sheet_title": sheet_title,
-                            "actions": []
-                        }
-                        
-                        # Extraire actions de la feuille
-                        if 'qSheetDef' in sheet and 'qMetaDef' in sheet['qSheetDef']:
-                            meta = sheet['qSheetDef']['qMetaDef']
-                            
-                            # Chercher les actions personnalisées
-                            if 'actions' in meta:
-                                for action in meta['actions']:
-                                    action_info = {
-                                        "id": action.get('id'),
-                                        "label": action.get('label', 'Action'),
-                                        "type": action.get('type', 'unknown'),
-                                        "target": {}
-                                    }
-                                    
-                                    # Déterminer le type d'action
-                                    if 'navigation' in action:
-                                        nav = action['navigation']
-                                        if 'targetSheetId' in nav:
-                                            action_info['target']['type'] = 'sheet'
-                                            action_info['target']['sheet_id'] = nav['targetSheetId']
-                                        elif 'targetUri' in nav:
-                                            action_info['target']['type'] = 'url'
-                                            action_info['target']['url'] = nav['targetUri']
-                                    
-                                    sheet_actions['actions'].append(action_info)
-                        
-                        if sheet_actions['actions']:
-                            actions_data['sheet_actions'].append(sheet_actions)
-                            actions_data['metadata']['total_actions'] += len(sheet_actions['actions'])
-                    
-                    actions_data['metadata']['total_sheets'] = len(app_data['qSheetList'])
-                    
-    except zipfile.BadZipFile:
-        print(f"❌ Erreur: {qvf_path} n'est pas un fichier QVF valide")
-    except Exception as e:
-        print(f"❌ Erreur lors de l'extraction: {str(e)}")
-    
-    return actions_data
+try:
+    import ijson  # Parseur JSON incrémental (optionnel)
+except ImportError:
+    ijson = None
 
+# Tampon de lecture du membre app.json pour le parseur incrémental
+_READ_BUFFER_SIZE = 1 << 16
 
-def generate_power_bi_button_guide(actions_data: Dict, output_dir: Path) -> str:
-    """
-    Génère un guide pour créer des boutons Power BI.
-    
-    Args:
-        actions_data: Données des actions extraites
-        output_dir: Répertoire de sortie
-        
-    Returns:
-        Chemin du guide généré
-    """
-    guide_path = output_dir / "NAVIGATION_BUTTONS_GUIDE.md"
-    
-    guide_content = f"""# 🔘 Guide Navigation - Qlik Sheet Actions vers Power BI
+# Tampon d'écriture du guide Markdown
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+# En-tête du guide des boutons, complété une fois par format_map
+_NAV_GUIDE_HEADER = """# 🔘 Guide Navigation - Qlik Sheet Actions vers Power BI
 
 **Date de génération :** 13 février 2026  
-**Fichier source :** {actions_data['metadata']['source_file']}  
-**Actions trouvées :** {actions_data['metadata']['total_actions']}  
-**Feuilles avec actions :** {len(actions_data['sheet_actions'])}
+**Fichier source :** {source_file}  
+**Actions trouvées :** {total_actions}  
+**Feuilles avec actions :** {sheet_count}
 
 ---
 
 ## 📋 Actions Détectées
 
 """
-    
-    for sheet_action in actions_data['sheet_actions']:
-        guide_content += f"""
-### Feuille: {sheet_action['sheet_title']}
+
+# Section d'une feuille (titre et en-tête du tableau des actions)
+_NAV_GUIDE_SHEET_SECTION = """
+### Feuille: {sheet_title}
 
 | Action | Type | Cible |
 |--------|------|-------|
 """
-        for action in sheet_action['actions']:
-            target_text = "N/A"
-            if action['target']:
-                if action['target']['type'] == 'sheet':
-                    target_text = f"Sheet: {action['target'].get('sheet_id', '?')}"
-                elif action['target']['type'] == 'url':
-                    target_text = f"URL: {action['target'].get('url', '?')}"
-            
-            guide_content += f"| {action['label']} | {action['type']} | {target_text} |\n"
-    
-    guide_content += """
+
+# Partie fixe du guide des boutons (approches, exemples, checklist)
+_NAV_GUIDE_TAIL = """
 
 ---
 
@@ -345,9 +274,260 @@ RETURN
 
 **✨ Guide généré automatiquement par migrate_navigation.py**
 """
+
+
+# Libellé de la cible d'une action, selon son type
+_TARGET_FORMATTERS = {
+    'sheet': lambda value: f"Sheet: {value}",
+    'url': lambda value: f"URL: {value}",
+}
+
+# Clé portant la valeur de la cible dans la configuration JSON, selon son type
+_TARGET_KEYS = {
+    'sheet': 'sheet_id',
+    'url': 'url',
+}
+
+
+@dataclass(slots=True)
+class Action:
+    """Sheet Action Qlik"""
+    id: Optional[str]
+    label: str
+    type: str
+    target_type: Optional[str] = None  # sheet, url
+    target_value: Optional[str] = None
+    
+    @property
+    def target_text(self) -> str:
+        """Colonne « Cible » du guide ; N/A si la cible est absente ou de type inconnu"""
+        formatter = _TARGET_FORMATTERS.get(self.target_type)
+        return formatter(self.target_value) if formatter is not None else "N/A"
+    
+    def as_config(self) -> Dict:
+        """Forme JSON de l'action (cible imbriquée, vide si absente)"""
+        target = {}
+        if self.target_type is not None:
+            target['type'] = self.target_type
+            target[_TARGET_KEYS[self.target_type]] = self.target_value
+        return {"id": self.id, "label": self.label, "type": self.type, "target": target}
+    
+    @classmethod
+    def from_config(cls, config: Dict) -> 'Action':
+        """Action depuis sa forme JSON ; cible sans valeur affichée « ? »"""
+        target = config.get('target') or {}
+        target_type = target.get('type')
+        key = _TARGET_KEYS.get(target_type)
+        if key is None:
+            return cls(config.get('id'), config['label'], config['type'])
+        return cls(config.get('id'), config['label'], config['type'], target_type, target.get(key, '?'))
+
+
+def _has_member(qvf: zipfile.ZipFile, name: str) -> bool:
+    """Présence d'un membre dans l'archive, via l'index nom → ZipInfo (sans construire namelist())"""
+    try:
+        qvf.getinfo(name)
+    except KeyError:
+        return False
+    return True
+
+
+def _iter_sheet_list(qvf: zipfile.ZipFile) -> Iterator:
+    """Entrées de qSheetList (racine d'app.json).
+    
+    Avec ijson, les feuilles sont lues en flux depuis le membre zip, sans charger
+    le document ; sinon il est chargé en entier.
+    """
+    if ijson is not None:
+        # Décompression et parsing entrelacés, par blocs de 64 KiB
+        with io.BufferedReader(qvf.open('app.json'), buffer_size=_READ_BUFFER_SIZE) as fp:
+            yield from ijson.items(fp, 'qSheetList.item', use_float=True)
+        return
+    
+    app_data = loads(qvf.read('app.json'))
+    
+    if 'qSheetList' in app_data:
+        yield from app_data['qSheetList']
+
+
+def _sheet_action_defs(sheet: Dict) -> Optional[List[Dict]]:
+    """Actions personnalisées brutes d'une entrée de qSheetList (qSheetDef.qMetaDef.actions)"""
+    if 'qSheetDef' in sheet and 'qMetaDef' in sheet['qSheetDef']:
+        return sheet['qSheetDef']['qMetaDef'].get('actions')
+    return None
+
+
+def _extract_actions(action_defs: Iterable[Dict]) -> List[Action]:
+    """Actions d'une feuille, depuis leurs définitions brutes"""
+    actions: List[Action] = []
+    
+    for action in action_defs:
+        action_info = Action(
+            action.get('id'),
+            action.get('label', 'Action'),
+            intern_str(action.get('type', 'unknown')),
+        )
+        
+        # Déterminer le type d'action
+        if 'navigation' in action:
+            nav = action['navigation']
+            if 'targetSheetId' in nav:
+                action_info.target_type = 'sheet'
+                action_info.target_value = nav['targetSheetId']
+            elif 'targetUri' in nav:
+                action_info.target_type = 'url'
+                action_info.target_value = nav['targetUri']
+        
+        actions.append(action_info)
     
-    with open(guide_path, 'w', encoding='utf-8') as f:
-        f.write(guide_content)
+    return actions
+
+
+def _extract_sheet_actions(sheet: Dict, actions: List[Action]) -> Dict:
+    """Enregistrement d'une feuille ayant des actions"""
+    return {
+        "sheet_id": sheet.get('qInfo', EMPTY).get('qId'),
+        "sheet_title": sheet.get('qMetaDef', EMPTY).get('title', 'Untitled'),
+        "actions": actions
+    }
+
+
+def _new_metadata(qvf_path: str) -> Dict:
+    """Métadonnées initiales, complétées pendant l'extraction"""
+    return {
+        "source_file": Path(qvf_path).name,
+        "total_actions": 0,
+        "total_sheets": 0
+    }
+
+
+def iter_sheet_actions(qvf_path: str, metadata: Dict) -> Iterator[Dict]:
+    """
+    Produit les feuilles ayant des actions, une à une, depuis un fichier QVF.
+    
+    Les compteurs de `metadata` sont tenus au fil de l'eau : total_actions à
+    chaque feuille produite, total_sheets une fois qSheetList parcourue.
+    
+    Args:
+        qvf_path: Chemin vers le fichier QVF
+        metadata: Métadonnées à compléter (voir _new_metadata)
+        
+    Yields:
+        Dictionnaire sheet_id / sheet_title / actions d'une feuille, les
+        actions étant des objets Action
+        
+    Raises:
+        zipfile.BadZipFile: si le fichier n'est pas un QVF valide ; les
+        erreurs de lecture ou de parsing d'app.json sont aussi propagées
+    """
+    with zipfile.ZipFile(qvf_path, 'r') as qvf:
+        if _has_member(qvf, 'app.json'):
+            total_sheets = 0
+            
+            # Extraire feuilles et leurs actions
+            for sheet in _iter_sheet_list(qvf):
+                total_sheets += 1
+                
+                # Feuilles sans actions (cas courant) écartées avant toute allocation
+                action_defs = _sheet_action_defs(sheet)
+                if not action_defs:
+                    continue
+                
+                actions = _extract_actions(action_defs)
+                metadata['total_actions'] += len(actions)
+                yield _extract_sheet_actions(sheet, actions)
+            
+            metadata['total_sheets'] = total_sheets
+
+
+def _read_sheet_actions(qvf_path: str, metadata: Dict, sheet_actions: List[Dict]) -> bool:
+    """Ajoute à sheet_actions les feuilles du QVF ; affiche l'erreur et retourne
+    False si la lecture échoue (les feuilles déjà lues restent dans la liste)"""
+    try:
+        for sheet_action in iter_sheet_actions(qvf_path, metadata):
+            sheet_actions.append(sheet_action)
+    except zipfile.BadZipFile:
+        print(f"❌ Erreur: {qvf_path} n'est pas un fichier QVF valide")
+        return False
+    except Exception as e:
+        print(f"❌ Erreur lors de l'extraction: {str(e)}")
+        return False
+    return True
+
+
+def extract_sheet_actions_from_qvf(qvf_path: str) -> Dict:
+    """
+    Extrait les sheet actions depuis un fichier QVF.
+    
+    Args:
+        qvf_path: Chemin vers le fichier QVF
+        
+    Returns:
+        Dictionnaire contenant les sheet actions trouvées (actions en
+        dictionnaires id / label / type / target)
+    """
+    metadata = _new_metadata(qvf_path)
+    sheet_actions = []
+    _read_sheet_actions(qvf_path, metadata, sheet_actions)
+    return {
+        "sheet_actions": [_sheet_config(s) for s in sheet_actions],
+        "navigation_patterns": [],
+        "metadata": metadata
+    }
+
+
+def _sheet_config(sheet_action: Dict) -> Dict:
+    """Forme JSON d'une feuille : ses actions converties par Action.as_config"""
+    return {
+        "sheet_id": sheet_action['sheet_id'],
+        "sheet_title": sheet_action['sheet_title'],
+        "actions": [action.as_config() for action in sheet_action['actions']]
+    }
+
+
+def _sheet_from_config(sheet_config: Dict) -> Dict:
+    """Feuille sous forme JSON (voir _sheet_config) → actions en objets Action"""
+    return dict(sheet_config, actions=[Action.from_config(action) for action in sheet_config['actions']])
+
+
+def _sheet_guide(sheet_action: Dict) -> str:
+    """Section du guide pour une feuille : titre et tableau de ses actions"""
+    return _NAV_GUIDE_SHEET_SECTION.format_map(sheet_action) + ''.join(
+        f"| {action.label} | {action.type} | {action.target_text} |\n"
+        for action in sheet_action['actions']
+    )
+
+
+def _write_guide(guide_path: Path, metadata: Dict, sheet_count: int, sections: Iterable[str]) -> None:
+    """Écrit le guide : en-tête (totaux), sections des feuilles puis partie fixe"""
+    # Fragments écrits au fil de l'eau, sans assembler le guide en mémoire
+    with open(guide_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write(_NAV_GUIDE_HEADER.format_map({
+            'source_file': metadata['source_file'],
+            'total_actions': metadata['total_actions'],
+            'sheet_count': sheet_count,
+        }))
+        f.writelines(sections)
+        f.write(_NAV_GUIDE_TAIL)
+
+
+def generate_power_bi_button_guide(actions_data: Dict, output_dir: Path) -> str:
+    """
+    Génère un guide pour créer des boutons Power BI.
+    
+    Args:
+        actions_data: Données des actions extraites (voir
+            extract_sheet_actions_from_qvf ; actions en dictionnaires)
+        output_dir: Répertoire de sortie
+        
+    Returns:
+        Chemin du guide généré
+    """
+    guide_path = output_dir / "NAVIGATION_BUTTONS_GUIDE.md"
+    
+    sheet_actions = [_sheet_from_config(s) for s in actions_data['sheet_actions']]
+    _write_guide(guide_path, actions_data['metadata'], len(sheet_actions),
+                 map(_sheet_guide, sheet_actions))
     
     return str(guide_path)
 
@@ -357,21 +537,54 @@ def generate_actions_config(actions_data: Dict, output_dir: Path) -> str:
     Génère un fichier JSON de configuration des actions.
     
     Args:
-        actions_data: Données des actions
+        actions_data: Données des actions (voir extract_sheet_actions_from_qvf ;
+            actions en dictionnaires)
         output_dir: Répertoire de sortie
         
     Returns:
         Chemin du fichier de configuration
     """
+    return write_json(output_dir / "navigation_config.json", actions_data)
+
+
+def generate_outputs(sheet_actions: Iterable[Dict], metadata: Dict, output_dir: Path) -> Tuple[str, str]:
+    """
+    Génère configuration JSON et guide en une seule passe sur les feuilles.
+    
+    Les feuilles sont extraites avant l'appel : une lecture en échec ne laisse
+    pas de fichiers tronqués. Chaque feuille est écrite dans la configuration
+    au passage ; seules les sections du guide sont gardées jusqu'à la fin, son
+    en-tête dépendant des totaux.
+    
+    Args:
+        sheet_actions: Feuilles ayant des actions (actions en objets Action)
+        metadata: Métadonnées à jour (totaux de l'extraction)
+        output_dir: Répertoire de sortie
+        
+    Returns:
+        Chemins du fichier de configuration et du guide
+    """
     config_path = output_dir / "navigation_config.json"
+    guide_path = output_dir / "NAVIGATION_BUTTONS_GUIDE.md"
     
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(actions_data, f, indent=2, ensure_ascii=False)
+    sections = []
+    sheet_count = 0
+    with open(config_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write('{\n  "sheet_actions": ')
+        for sheet_count, sheet_action in enumerate(sheet_actions, 1):
+            f.write(json_array_item(_sheet_config(sheet_action), sheet_count == 1))
+            sections.append(_sheet_guide(sheet_action))
+        f.write(json_array_end(sheet_count))
+        f.write(',\n  "navigation_patterns": [],\n  "metadata": ')
+        f.write(dumps_indented(metadata).replace('\n', '\n  ') + '\n}')
     
-    return str(config_path)
+    _write_guide(guide_path, metadata, sheet_count, sections)
+    
+    return str(config_path), str(guide_path)
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
+    """Parseur de la ligne de commande (construit uniquement pour la CLI)"""
     parser = argparse.ArgumentParser(
         description="Migrer Qlik Sheet Actions vers Boutons Power BI"
     )
@@ -390,14 +603,32 @@ def main():
         action="store_true",
         help="Générer un guide d'exemple sans QVF"
     )
+    parser.add_argument(
+        "--qvf-glob",
+        metavar="GLOB",
+        help="Traiter en parallèle tous les QVF correspondants (un sous-répertoire par fichier)"
+    )
+    return parser
+
+
+def run(qvf_path: Optional[str] = None, output_dir: str = "output/navigation", example: bool = False) -> int:
+    """
+    Extrait les sheet actions et génère la configuration et le guide.
     
-    args = parser.parse_args()
+    Point d'entrée des appelants programmatiques, sans passer par argparse.
     
+    Args:
+        qvf_path: Chemin vers le fichier QVF (exemple généré si absent)
+        output_dir: Répertoire de sortie
+        example: Générer un guide d'exemple sans QVF
+        
+    Returns:
+        Code de sortie (0 si succès)
+    """
     # Créer répertoire de sortie
-    output_dir = Path(args.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = ensure_output_dir(output_dir)
     
-    if args.example or not args.qvf_path:
+    if example or not qvf_path:
         # Générer exemple
         print("🔘 Génération d'un guide d'exemple...")
         example_data = {
@@ -438,32 +669,40 @@ def main():
                 "total_sheets": 2
             }
         }
+        metadata = example_data['metadata']
+        
+        # Générer fichiers
+        print(f"\n📝 Génération des fichiers de sortie...")
+        
+        config_file = generate_actions_config(example_data, output_dir)
+        guide_file = generate_power_bi_button_guide(example_data, output_dir)
     else:
         # Extraire depuis QVF
-        qvf_path = args.qvf_path
         if not Path(qvf_path).exists():
             print(f"❌ Fichier introuvable: {qvf_path}")
             return 1
         
         print(f"📂 Lecture de {qvf_path}...")
-        example_data = extract_sheet_actions_from_qvf(qvf_path)
         
-        if example_data['metadata']['total_actions'] == 0:
+        # Extraction complète avant toute écriture
+        metadata = _new_metadata(qvf_path)
+        sheet_actions = []
+        if not _read_sheet_actions(qvf_path, metadata, sheet_actions):
+            return 1
+        
+        print(f"\n📝 Génération des fichiers de sortie...")
+        config_file, guide_file = generate_outputs(sheet_actions, metadata, output_dir)
+        
+        if metadata['total_actions'] == 0:
             print("⚠️ Aucune Sheet Action trouvée")
             print("💡 Conseil: Les Sheet Actions sont courantes en QlikView.")
     
-    # Générer fichiers
-    print(f"\n📝 Génération des fichiers de sortie...")
-    
-    config_file = generate_actions_config(example_data, output_dir)
     print(f"✅ Configuration: {config_file}")
-    
-    guide_file = generate_power_bi_button_guide(example_data, output_dir)
     print(f"✅ Guide: {guide_file}")
     
     print(f"\n🎯 Résumé:")
-    print(f"  Actions trouvées: {example_data['metadata']['total_actions']}")
-    print(f"  Feuilles: {example_data['metadata']['total_sheets']}")
+    print(f"  Actions trouvées: {metadata['total_actions']}")
+    print(f"  Feuilles: {metadata['total_sheets']}")
     
     print(f"\n📊 Prochaines étapes:")
     print(f"  1. Consulter: {guide_file}")
@@ -473,6 +712,51 @@ def main():
     return 0
 
 
+def run_many(qvf_paths: List[str], output_dir: str = "output/navigation",
+             max_workers: Optional[int] = None) -> int:
+    """
+    Traite plusieurs QVF en parallèle (un processus par fichier).
+    
+    Décompression et parsing JSON restent liés au GIL : les processus passent
+    à l'échelle avec le nombre de cœurs. Les sorties de chaque QVF vont dans
+    output_dir/<nom du QVF> ; les messages sont affichés dans l'ordre de
+    `qvf_paths`.
+    
+    Returns:
+        Code de sortie (0 si tous les QVF ont été traités)
+    """
+    status = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(call_captured, run, path, str(Path(output_dir) / Path(path).stem))
+                   for path in qvf_paths]
+        for path, future in zip(qvf_paths, futures):
+            try:
+                code, output = future.result()
+            except Exception as e:
+                print(f"❌ Erreur ({path}): {e}")
+                status = 1
+                continue
+            print(output, end='')
+            status = max(status, code)
+    return status
+
+
+def main(argv=None):
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.qvf_glob is not None:
+        if args.qvf_path or args.example:
+            parser.error("--qvf-glob exclut qvf_path et --example")
+        qvf_paths = sorted(glob.glob(args.qvf_glob))
+        if not qvf_paths:
+            print(f"❌ Aucun fichier ne correspond à {args.qvf_glob}")
+            return 1
+        return run_many(qvf_paths, args.output_dir)
+    
+    return run(args.qvf_path, args.output_dir, args.example)
+
+
 if __name__ == "__main__":
     import sys
     sys.exit(main())
@@ -1,11 +1,10 @@
 """Migration - NPrinting Templates vers Power BI Paginated Reports"""
-import json
 from pathlib import Path
 
+from _common import ensure_output_dir, write_markdown
 
-def generate_npprinting_guide(output_dir: Path) -> str:
-    guide_path = output_dir / "NPPRINTING_MIGRATION_GUIDE.md"
-    content = """# 📄 Guide Migration - NPrinting vers Power BI Paginated Reports
+
+_NPPRINTING_GUIDE_TEXT = """# 📄 Guide Migration - NPrinting vers Power BI Paginated Reports
 
 **Date :** 13 février 2026
 
@@ -71,12 +70,14 @@ Plutôt que Paginated Reports complexes, utiliser:
 
 **Effort :** 1-2 semaines | **Complexité :** Moyenne-Élevée
 """
-    with open(guide_path, 'w') as f:
-        f.write(content); return str(guide_path)
+
+
+def generate_npprinting_guide(output_dir: Path) -> str:
+    guide_path = output_dir / "NPPRINTING_MIGRATION_GUIDE.md"
+    return write_markdown(guide_path, _NPPRINTING_GUIDE_TEXT)
 
 def main():
-    output_dir = Path("output/npprinting")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = ensure_output_dir("output/npprinting")
     guide_file = generate_npprinting_guide(output_dir)
     print(f"✅ NPrinting guide: {guide_file}")
     return 0
@@ -1,8 +1,9 @@
 """Migration - On-Demand App Generation vers Dynamic Report Patterns"""
-import json; from pathlib import Path
-def gen_guide(output_dir: Path) -> str:
-    path = output_dir / "ON_DEMAND_GENERATION_MIGRATION_GUIDE.md"
-    content = """# 🚀 Guide Migration - On-Demand App Generation vers Power BI Alternatives
+from pathlib import Path
+from _common import ensure_output_dir, write_markdown
+
+
+_ON_DEMAND_GUIDE_TEXT = """# 🚀 Guide Migration - On-Demand App Generation vers Power BI Alternatives
 
 **Date :** 13 février 2026
 
@@ -55,12 +56,14 @@ User B → Workspace B (filtered data via RLS) → Report
 
 **Effort :** 1-3 semaines | **Complexité :** Moyenne
 """
-    with open(path, 'w') as f: f.write(content)
-    return str(path)
+
+
+def gen_guide(output_dir: Path) -> str:
+    path = output_dir / "ON_DEMAND_GENERATION_MIGRATION_GUIDE.md"
+    return write_markdown(path, _ON_DEMAND_GUIDE_TEXT)
 
 def main():
-    output_dir = Path("output/on_demand_generation")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = ensure_output_dir("output/on_demand_generation")
     print(f"✅ On-Demand Generation: {gen_guide(output_dir)}")
     return 0
 